@@ -18,7 +18,7 @@ from dataclasses import dataclass
 
 # ========== Data Classes ==========
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoResult:
     """
     Result từ video generation request
@@ -36,7 +36,7 @@ class VideoResult:
     generation_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CreditsInfo:
     """
     Credits information
@@ -57,7 +57,7 @@ class CreditsInfo:
         return self.credits is not None and self.credits > 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UploadResult:
     """
     Result từ image upload
@@ -72,7 +72,7 @@ class UploadResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoData:
     """
     Video data khi generation complete
@@ -95,7 +95,7 @@ class VideoData:
         return self.status == "completed"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PendingTask:
     """
     Pending task information
@@ -230,7 +230,7 @@ class VideoGenerationDriver(ABC):
             poll_interval: Seconds between polls
 
         Returns:
-            VideoData when complete, None if timeout
+            VideoData when complete or failed (status "failed"), None if timeout
 
         Raises:
             Exception: If polling fails
@@ -328,7 +328,7 @@ class APIOnlyDriver(VideoGenerationDriver):
             user_agent: User agent string
         """
         self.access_token = access_token
-        self.device_id = device_id
+        self.device_id = device_id or ""
         self.user_agent = user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
 
     async def start(self) -> None:
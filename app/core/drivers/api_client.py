@@ -3,53 +3,366 @@ import asyncio
 import logging
 import json
 import os
-import urllib3
+import random
+import re
 import time
+from collections import deque
+from functools import lru_cache
 from curl_cffi import requests
+from curl_cffi import CurlHttpVersion, CurlMime
 from typing import Optional, Dict, Any, List
+from app.core.drivers import json_utils
+from app.core.drivers.abstractions import UploadResult
 
 logger = logging.getLogger(__name__)
 
+# Draft fields that may hold the finished video URL, in preference order
+_URL_FIELDS = ("url", "downloadable_url", "video_url")
+
+
+def extract_download_url(draft: Dict) -> Optional[str]:
+    """First non-empty video URL field of a draft, or None"""
+    return next((draft[k] for k in _URL_FIELDS if draft.get(k)), None)
+
+# First '#'-separated segment that is a file ID ("...#file_abc#..." -> "file_abc")
+_FILE_ID_RE = re.compile(r"(?:^|#)(file[_-][^#]*)")
+
+
+def clean_file_id(file_id: str) -> str:
+    """Upload file ID with any '#'-joined prefix/suffix stripped; unchanged if none matches"""
+    m = _FILE_ID_RE.search(file_id)
+    return m.group(1) if m else file_id
+
+# nf/create requires every field, even when unset; per-call values are filled in
+_BASE_VIDEO_PAYLOAD = {
+    "kind": "video",
+    "prompt": None,
+    "title": None,
+    "orientation": None,
+    "size": "small",
+    "n_frames": None,
+    "inpaint_items": None,
+    "remix_target_id": None,
+    "metadata": None,
+    "cameo_ids": None,
+    "cameo_replacements": None,
+    "model": "sy_8",
+    "style_id": None,
+    "audio_caption": None,
+    "audio_transcript": None,
+    "video_caption": None,
+    "storyboard_id": None
+}
+
+
+def build_video_payload(prompt: str, orientation: str, n_frames: int, size: str = "small",
+                        model: str = "sy_8", file_id: Optional[str] = None) -> Dict[str, Any]:
+    """nf/create payload from the shared template, with an optional image attachment"""
+    payload = _BASE_VIDEO_PAYLOAD.copy()
+    payload["prompt"] = prompt
+    payload["orientation"] = orientation
+    payload["size"] = size
+    payload["n_frames"] = n_frames
+    payload["model"] = model
+    # Fresh list per call - the template is only shallow-copied
+    payload["inpaint_items"] = [{"kind": "file", "file_id": clean_file_id(file_id)}] if file_id else []
+    return payload
+
+# Template fields build_video_payload never touches, pre-serialized once as the
+# body's opening bytes ('{"kind":"video",...,') - only the per-call fields
+# are encoded per request
+_VIDEO_VARIANT_KEYS = ("prompt", "orientation", "size", "n_frames", "model", "inpaint_items")
+_VIDEO_STABLE_ITEMS = tuple((k, v) for k, v in _BASE_VIDEO_PAYLOAD.items() if k not in _VIDEO_VARIANT_KEYS)
+_VIDEO_BODY_PREFIX = json_utils.dumpb(dict(_VIDEO_STABLE_ITEMS))[:-1] + b","
+
+
+def encode_video_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    JSON body for an nf/create payload.
+
+    Payloads from build_video_payload reuse the pre-serialized template
+    prefix; anything else (extra keys, edited template fields) is encoded
+    in full.
+    """
+    if len(payload) == len(_BASE_VIDEO_PAYLOAD) and all(
+            k in payload and payload[k] == v for k, v in _VIDEO_STABLE_ITEMS):
+        try:
+            variant = {k: payload[k] for k in _VIDEO_VARIANT_KEYS}
+        except KeyError:
+            return json_utils.dumpb(payload)
+        return _VIDEO_BODY_PREFIX + json_utils.dumpb(variant)[1:]
+    return json_utils.dumpb(payload)
+
+
+@lru_cache(maxsize=16)
+def _normalize_sentinel(token: str) -> str:
+    """Re-serialized sentinel string; cached tokens repeat, so this is memoized"""
+    return json.dumps(json.loads(token))
+
+
+def sentinel_header(token: Any) -> str:
+    """
+    openai-sentinel-token header value, serialized exactly like the old code:
+    json.dumps(json.loads(token)) for strings, json.dumps(token) otherwise.
+    """
+    if isinstance(token, str):
+        return _normalize_sentinel(token)
+    return json.dumps(token)
+
+# Throttling/overload statuses worth retrying; 401/403 are returned at once
+_RETRY_STATUSES = (429, 502, 503, 504)
+# Publishing is not idempotent - a 502/504 may have gone through upstream, so
+# only statuses that guarantee the request was refused are retried
+_POST_RETRY_STATUSES = (429, 503)
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE = 1.0
+_RETRY_CAP = 30.0
+
+# Credits barely move second to second; reuse a successful lookup this long
+_CREDITS_TTL = 7.0
+
+# Pause proactively once x-ratelimit-remaining-requests drops below
+# max(_RATE_LIMIT_FLOOR, _RATE_LIMIT_FRACTION * limit)
+_RATE_LIMIT_FLOOR = 2
+_RATE_LIMIT_FRACTION = 0.1
+# Local ceiling for endpoints that send no rate-limit headers
+_LOCAL_RPM = 120
+_RPM_WINDOW = 60.0
+
+# AIMD bound on concurrent requests: +_AIMD_INCREASE every _AIMD_EVERY
+# calls while mean latency stays under target, halved on throttling/errors
+_AIMD_INITIAL = 4
+_AIMD_MIN = 1
+_AIMD_MAX = 16
+_AIMD_INCREASE = 0.5
+_AIMD_DECREASE = 0.5
+_AIMD_TARGET_LATENCY = 3.0
+_AIMD_WINDOW = 32
+_AIMD_EVERY = 8
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def _parse_reset(value: str) -> float:
+    """Seconds from an x-ratelimit-reset value ("12", "1.5s", "6m0s", "20ms")"""
+    try:
+        return float(value)
+    except ValueError:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in _DURATION_RE.findall(value))
+
+
+def _write_debug_json(path: str, data) -> None:
+    """Dump a response for debugging (run in a worker thread)"""
+    with open(path, "w") as f:
+        f.write(json_utils.pretty(data))
+
 class SoraApiClient:
     def __init__(self, access_token: str, user_agent: str, cookies: Optional[Dict] = None, account_email: str = None, device_id: str = None):
-        self.access_token = access_token
         self.user_agent = user_agent
-        self.cookies = cookies or {}
         self.account_email = account_email
-        self.device_id = device_id
+        self.device_id = device_id or ""
         
         # Log prefix
         self.log_prefix = f"[Account: {self.account_email}]" if self.account_email else "[Account: Unknown]"
-        
-        # Build cookie string and normalized dict
-        self.cookie_dict = {}
-        if isinstance(self.cookies, list):
-             for c in self.cookies:
-                 if isinstance(c, dict) and 'name' in c and 'value' in c:
-                     self.cookie_dict[c['name']] = c['value']
-        elif isinstance(self.cookies, dict):
-             self.cookie_dict = self.cookies
-
-        self.cookie_str = "; ".join([f"{k}={v}" for k, v in self.cookie_dict.items()])
-
 
         # Base headers mimicking browser
+        # (Authorization/Cookie are filled in below; keys listed to keep header order)
         self.headers = {
-            "Authorization": f"Bearer {access_token}" if not access_token.startswith("Bearer") else access_token,
+            "Authorization": "",
             "User-Agent": user_agent,
             "Accept": "*/*",
             "Accept-Language": "en-US,en;q=0.9",
             "Origin": "https://sora.chatgpt.com",
             "Referer": "https://sora.chatgpt.com/",
-            "Cookie": self.cookie_str,
+            "Cookie": "",
             "Sec-Fetch-Dest": "empty",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Site": "same-origin",
-            "oai-device-id": self.device_id or "",
+            "oai-device-id": self.device_id,
             "oai-language": "en-US",
             "priority": "u=1, i"
         }
 
+        # Keep-alive session shared by every backend call (created lazily)
+        self._session: Optional[AsyncSession] = None
+
+        self._credits_cache = None # (access token, fetched at, summary) of the last good lookup
+
+        # Rate-limit state: header-driven pause and recent send times
+        self._pause_until = 0.0
+        self._recent_requests = deque()
+
+        # AIMD concurrency: permits in use vs the (fractional) current limit
+        self._conc = float(_AIMD_INITIAL)
+        self._in_flight = 0
+        self._slot_free = asyncio.Condition()
+        self._latencies = deque(maxlen=_AIMD_WINDOW)
+        self._calls_since_adjust = 0
+
+        # Builds cookie_dict / cookie_str and the Cookie header once
+        self.set_cookies(cookies)
+        self.set_access_token(access_token)
+
+    def set_access_token(self, access_token: str) -> None:
+        """Swap in a rotated token; the prebuilt headers are reused by every call"""
+        self.access_token = access_token
+        self.headers["Authorization"] = access_token if access_token.startswith("Bearer") else f"Bearer {access_token}"
+
+    def set_cookies(self, cookies) -> None:
+        """
+        Replace the session cookies (Playwright cookie list or name->value dict).
+
+        The derived dict, header string and Cookie header are rebuilt here
+        only, so per-request code never walks the cookie list.
+        """
+        self.cookies = cookies or {}
+        self.cookie_dict = {}
+        if isinstance(self.cookies, list):
+             for c in self.cookies:
+                 if isinstance(c, dict) and 'name' in c and 'value' in c:
+                     self.cookie_dict[c['name']] = c['value']
+        elif isinstance(self.cookies, dict):
+             self.cookie_dict = self.cookies
+
+        self.cookie_str = "; ".join([f"{k}={v}" for k, v in self.cookie_dict.items()])
+        self.headers["Cookie"] = self.cookie_str
+
+    def _get_session(self) -> AsyncSession:
+        """
+        Shared session so every backend call reuses one TCP+TLS connection.
+
+        Pinned to HTTP/2 (falling back to 1.1 only if ALPN refuses) so the
+        concurrent pending + drafts fetches multiplex as two streams on a
+        single connection instead of opening a second one.
+        """
+        if self._session is None:
+            self._session = AsyncSession(impersonate="chrome", http_version=CurlHttpVersion.V2TLS)
+        return self._session
+
+    async def _request_with_backoff(self, method: str, url: str, *, retry_statuses=_RETRY_STATUSES, **kwargs):
+        """
+        Send a request over the shared session, retrying throttled responses.
+
+        On a status in retry_statuses it sleeps for Retry-After when given,
+        else full jitter (random() * min(cap, base * 2**attempt)), up to
+        _RETRY_ATTEMPTS times. The last response is returned either way.
+        """
+        session = self._get_session()
+        for attempt in range(_RETRY_ATTEMPTS + 1):
+            await self._wait_if_throttled()
+            response = await self._send(session, method, url, **kwargs)
+            self._note_rate_limit(response)
+            if response.status_code not in retry_statuses or attempt == _RETRY_ATTEMPTS:
+                return response
+
+            retry_after = response.headers.get("Retry-After") or ""
+            if retry_after.isdigit():
+                delay = min(float(retry_after), _RETRY_CAP)
+            else:
+                delay = random.random() * min(_RETRY_CAP, _RETRY_BASE * 2 ** attempt)
+            logger.warning(f"{self.log_prefix} [API] {url} returned {response.status_code}, retrying in {delay:.1f}s ({attempt + 1}/{_RETRY_ATTEMPTS})")
+            await asyncio.sleep(delay)
+
+    async def _get_json(self, url: str, *, headers: Optional[Dict] = None, timeout: int = 15, **kwargs) -> tuple:
+        """
+        GET a backend endpoint with the client's headers, cookies and backoff.
+
+        Returns:
+            (response, parsed body) - the body is None unless the status is
+            200 and it parses as JSON
+        """
+        response = await self._request_with_backoff(
+            "GET",
+            url,
+            headers=headers or self.headers,
+            cookies=self.cookie_dict,
+            timeout=timeout,
+            **kwargs
+        )
+        data = None
+        if response.status_code == 200:
+            try:
+                data = json_utils.loads(response.content)
+            except ValueError:
+                logger.warning(f"{self.log_prefix} [API] {url} returned non-JSON body")
+        return response, data
+
+    async def _send(self, session: AsyncSession, method: str, url: str, **kwargs):
+        """One request under the AIMD concurrency limit"""
+        async with self._slot_free:
+            await self._slot_free.wait_for(lambda: self._in_flight < int(self._conc))
+            self._in_flight += 1
+
+        started = time.monotonic()
+        throttled = True
+        try:
+            response = await session.request(method, url, **kwargs)
+            throttled = response.status_code in _RETRY_STATUSES
+            return response
+        finally:
+            async with self._slot_free:
+                self._in_flight -= 1
+                self._adjust_concurrency(time.monotonic() - started, throttled)
+                self._slot_free.notify_all()
+
+    def _adjust_concurrency(self, latency: float, throttled: bool) -> None:
+        """Additive increase on healthy latency, multiplicative decrease otherwise"""
+        if throttled:
+            self._conc = max(_AIMD_MIN, self._conc * _AIMD_DECREASE)
+            self._calls_since_adjust = 0
+            return
+
+        self._latencies.append(latency)
+        self._calls_since_adjust += 1
+        if self._calls_since_adjust < _AIMD_EVERY:
+            return
+        self._calls_since_adjust = 0
+        mean_latency = sum(self._latencies) / len(self._latencies)
+        if mean_latency <= _AIMD_TARGET_LATENCY:
+            self._conc = min(_AIMD_MAX, self._conc + _AIMD_INCREASE)
+        else:
+            self._conc = max(_AIMD_MIN, self._conc * _AIMD_DECREASE)
+
+    async def _wait_if_throttled(self) -> None:
+        """Hold the next request until the header pause and local RPM allow it"""
+        delay = self._pause_until - time.monotonic()
+        if delay > 0:
+            logger.info(f"{self.log_prefix} [WAIT] Rate limit nearly exhausted, pausing {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        window = self._recent_requests
+        while window and now - window[0] >= _RPM_WINDOW:
+            window.popleft()
+        if len(window) >= _LOCAL_RPM:
+            await asyncio.sleep(window[0] + _RPM_WINDOW - now)
+            now = time.monotonic()
+        window.append(now)
+
+    def _note_rate_limit(self, response) -> None:
+        """Schedule a pause when the x-ratelimit-* headers show little headroom"""
+        remaining = response.headers.get("x-ratelimit-remaining-requests")
+        if remaining is None:
+            return
+        try:
+            remaining = int(remaining)
+            limit = int(response.headers.get("x-ratelimit-limit-requests") or 0)
+            reset = _parse_reset(response.headers.get("x-ratelimit-reset-requests") or response.headers.get("x-ratelimit-reset") or "0")
+        except (ValueError, TypeError):
+            return
+        if remaining < max(_RATE_LIMIT_FLOOR, _RATE_LIMIT_FRACTION * limit):
+            self._pause_until = max(self._pause_until, time.monotonic() + reset)
+
+    async def aclose(self):
+        """Close the shared session"""
+        if self._session is not None:
+            session, self._session = self._session, None
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"{self.log_prefix} [API] Session close failed: {e}")
+
     def get_tasks(self, limit: int = 10) -> Dict[str, Any]:
         """
         Poll recent tasks (videos).
@@ -76,7 +389,7 @@ class SoraApiClient:
         # print(f"DEBUG Body: {response.text[:200]}") 
 
         if response.status_code == 200:
-            return response.json()
+            return json_utils.loads(response.content)
         else:
              logger.error(f"API Error {response.status_code}: {response.text[:500]}")
              if response.status_code == 401:
@@ -98,58 +411,58 @@ class SoraApiClient:
         ext = os.path.splitext(image_path)[1].lower()
         mime_type = "image/jpeg" if ext in [".jpg", ".jpeg"] else "image/png"
 
+        # libcurl streams the part from disk - the image is never held in memory
+        multipart = CurlMime()
         try:
-            with open(image_path, 'rb') as f:
-                file_content = f.read()
+            multipart.addpart(
+                name="file",
+                content_type=mime_type,
+                filename=filename,
+                local_path=image_path
+            )
 
-            # Manual Multipart Encoding
-            fields = {
-                'file': (filename, file_content, mime_type)
-            }
-            
-            body, content_type = urllib3.encode_multipart_formdata(fields)
-            
-            # Copy headers and add Content-Type
+            # libcurl writes the multipart Content-Type (with boundary) itself
             headers = self.headers.copy()
-            headers["Content-Type"] = content_type
             # BUG FIX: Don't overwrite Authorization - it's already properly formatted in self.headers (line 33)
             # headers["Authorization"] = self.access_token  # REMOVED - this was breaking auth
 
             logger.info(f"🔌 {self.log_prefix} [API] Uploading image: {filename}...")
             
             # Use 'chrome' to match old code
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.post(
-                    "https://sora.chatgpt.com/backend/project_y/file/upload",
-                    headers=headers,
-                    data=body,
-                    cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
-                    timeout=60
-                )
+            response = await self._send(
+                self._get_session(),
+                "POST",
+                "https://sora.chatgpt.com/backend/project_y/file/upload",
+                headers=headers,
+                multipart=multipart,
+                cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
+                timeout=60
+            )
 
-                if response.status_code == 200:
-                    data = json.loads(response.text)
-                    
-                    # Formatted Response Log
-                    logger.info(f"====== 📥 UPLOAD IMAGE RESPONSE ======")
-                    logger.info(json.dumps(data, indent=2))
-                    logger.info("======================================")
-                    
-                    logger.info(f"{self.log_prefix} [OK] [API] Image uploaded: {data.get('file_id')}")
-                    from app.core.drivers.abstractions import UploadResult
-                    return UploadResult(
-                        success=True,
-                        file_id=data.get('file_id'),
-                        error=None
-                    )
-                else:
-                    logger.error(f"{self.log_prefix} [ERROR] [API] Upload failed ({response.status_code}): {response.text}")
-                    from app.core.drivers.abstractions import UploadResult
-                    return UploadResult(success=False, error=f"{response.status_code} - {response.text}")
+            if response.status_code == 200:
+                data = json_utils.loads(response.content)
+                
+                # Formatted Response Log
+                logger.info(f"====== 📥 UPLOAD IMAGE RESPONSE ======")
+                logger.info(json_utils.pretty(data))
+                logger.info("======================================")
+                
+                logger.info(f"{self.log_prefix} [OK] [API] Image uploaded: {data.get('file_id')}")
+                return UploadResult(
+                    success=True,
+                    file_id=data.get('file_id'),
+                    error=None
+                )
+            else:
+                text = response.text
+                logger.error(f"{self.log_prefix} [ERROR] [API] Upload failed ({response.status_code}): {text}")
+                return UploadResult(success=False, error=f"{response.status_code} - {text}")
 
         except Exception as e:
             logger.error(f"[ERROR] [API] Upload exception: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            multipart.close()
 
     async def generate_video(self, payload: Dict[str, Any], sentinel_token: str, device_id: str) -> Dict[str, Any]:
         """
@@ -160,15 +473,9 @@ class SoraApiClient:
         headers = self.headers.copy()
         headers['Content-Type'] = 'application/json'
         
-        # CRITICAL: Serialize sentinel token exactly like old code does
-        # Old code: json.dumps(json.loads(sentinel_payload) if isinstance(sentinel_payload, str) else sentinel_payload)
+        # CRITICAL: Serialize sentinel token exactly like old code does (see sentinel_header)
         try:
-            if isinstance(sentinel_token, str):
-                # Parse and re-serialize to ensure proper JSON format
-                parsed = json.loads(sentinel_token)
-                headers['openai-sentinel-token'] = json.dumps(parsed)
-            else:
-                headers['openai-sentinel-token'] = json.dumps(sentinel_token)
+            headers['openai-sentinel-token'] = sentinel_header(sentinel_token)
         except Exception as e:
             logger.warning(f"{self.log_prefix} [WARNING] Sentinel token serialization failed: {e}")
             headers['openai-sentinel-token'] = sentinel_token
@@ -178,36 +485,41 @@ class SoraApiClient:
 
         # Formatted Payload Log
         logger.info(f"====== � GENERATE VIDEO PAYLOAD ======")
-        logger.info(json.dumps(payload, indent=2))
+        logger.info(json_utils.pretty(payload))
         logger.info("==========================================")
 
         try:
             # Use 'chrome' impersonate to match old code exactly (not 'chrome120')
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.post(
-                    url,
-                    headers=headers,
-                    json=payload,
-                    cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
-                    timeout=30
-                )
+            # Not retried (a replay could double-submit), but bounded by AIMD
+            response = await self._send(
+                self._get_session(),
+                "POST",
+                url,
+                headers=headers,
+                data=encode_video_payload(payload),  # Content-Type set above
+                cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
+                timeout=30
+            )
 
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        # Formatted Response Log
-                        logger.info(f"====== 📥 GENERATE VIDEO RESPONSE ======")
-                        logger.info(json.dumps(data, indent=2))
-                        logger.info("========================================")
-                        
-                        task_id = data.get('id') or data.get('task_id')
-                        return {"success": True, "task_id": task_id, "response": data}
-                    except:
-                        logger.info(f"{self.log_prefix} [OK] [API] Generation started! Response: {response.text}")
-                        return {"success": True, "response": response.text}
-                else:
-                    logger.error(f"{self.log_prefix} [ERROR] [API] Generate failed ({response.status_code}): {response.text}")
-                    return {"success": False, "error": response.text}
+            if response.status_code == 200:
+                self._credits_cache = None # A generation just spent credits
+                try:
+                    data = json_utils.loads(response.content)
+                    # Formatted Response Log
+                    logger.info(f"====== 📥 GENERATE VIDEO RESPONSE ======")
+                    logger.info(json_utils.pretty(data))
+                    logger.info("========================================")
+                    
+                    task_id = data.get('id') or data.get('task_id')
+                    return {"success": True, "task_id": task_id, "response": data}
+                except:
+                    text = response.text
+                    logger.info(f"{self.log_prefix} [OK] [API] Generation started! Response: {text}")
+                    return {"success": True, "response": text}
+            else:
+                text = response.text
+                logger.error(f"{self.log_prefix} [ERROR] [API] Generate failed ({response.status_code}): {text}")
+                return {"success": False, "error": text}
 
         except Exception as e:
              logger.error(f"[ERROR] [API] Generate exception: {e}")
@@ -219,25 +531,18 @@ class SoraApiClient:
         params = {"limit": limit}
         
         try:
-            # Use 'chrome' to match old code
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.get(
-                    url,
-                    headers=self.headers,
-                    params=params,
-                    cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
-                    timeout=20
-                )
-                
-                if response.status_code == 200:
-                    # Log full response for debugging
-                    logger.info(f"[API] Get drafts success. Response: {response.text[:2000]}...") # Limit to avoid massive logs if too big
-                    data = response.json()
-                    items = data.get("items", data) if isinstance(data, dict) else data
-                    return items
-                else:
-                     logger.warning(f"[API] Get drafts failed: {response.status_code} - {response.text}")
-                     return []
+            # Polled every few seconds - reuse the keep-alive session
+            response, data = await self._get_json(url, params=params, timeout=20)
+            
+            if data is not None:
+                # Log response head for debugging - only the logged slice is decoded
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[API] Get drafts success. Response: %s...", response.content[:2000].decode(errors="replace"))
+                items = data.get("items", data) if isinstance(data, dict) else data
+                return items
+            else:
+                 logger.warning(f"[API] Get drafts failed: {response.status_code} - {response.text}")
+                 return []
         except Exception as e:
             logger.error(f"[API] Get drafts exception: {e}")
             return []
@@ -249,34 +554,69 @@ class SoraApiClient:
         """
         # Priority 1: curl_cffi
         try:
-            # Use 'chrome' to match old code
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.get(
-                    "https://sora.chatgpt.com/backend/nf/pending/v2",
-                    headers=self.headers,
-                    cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
-                    timeout=15
-                )
-                if response.status_code == 200:
-                    # Log full response for debugging
-                    logger.info(f"{self.log_prefix} [API] get_pending_tasks response: {response.text}")
-                    data = response.json()
-                    task_list = data if isinstance(data, list) else []
-                    logger.info(f"{self.log_prefix} [API] get_pending_tasks found {len(task_list)} tasks")
-                    return task_list
-                else:
-                    logger.warning(f"{self.log_prefix} [API] get_pending_tasks failed: {response.status_code} - {response.text}")
+            # Polled every few seconds - reuse the keep-alive session
+            response, data = await self._get_json("https://sora.chatgpt.com/backend/nf/pending/v2")
+            if data is not None:
+                # Log full response for debugging (decoded only when DEBUG is on)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s [API] get_pending_tasks response: %s", self.log_prefix, response.content.decode(errors="replace"))
+                task_list = data if isinstance(data, list) else []
+                logger.info(f"{self.log_prefix} [API] get_pending_tasks found {len(task_list)} tasks")
+                return task_list
+            else:
+                logger.warning(f"{self.log_prefix} [API] get_pending_tasks failed: {response.status_code} - {response.text}")
         except Exception as e:
             logger.warning(f"[API] get_pending_tasks (curl) failed: {e}")
         
         return []
 
 
+    async def refresh_state(
+        self,
+        include_credits: bool = False,
+        include_drafts: bool = True,
+        drafts_limit: int = 15
+    ) -> tuple:
+        """
+        Credits (optional), pending tasks and drafts (optional) fetched concurrently.
+
+        All three ride the shared HTTP/2 session as parallel streams, so a
+        poll tick costs the slowest request rather than the sum. Pollers
+        waiting on a pending task should pass include_drafts=False and only
+        fetch drafts once the task has left pending.
+
+        Returns:
+            (credits summary or None, pending list, drafts list or None); a
+            fetch that raised or was skipped comes back as None
+        """
+        credits_call = self.get_credits_summary(device_id=self.device_id) if include_credits else asyncio.sleep(0)
+        drafts_call = self.get_drafts(limit=drafts_limit) if include_drafts else asyncio.sleep(0)
+        results = await asyncio.gather(
+            credits_call,
+            self.get_pending_tasks(),
+            drafts_call,
+            return_exceptions=True
+        )
+        return tuple(None if isinstance(r, BaseException) else r for r in results)
+
     async def get_credits_summary(self, device_id: str = None, sentinel_token: str = None) -> Dict[str, Any]:
         """
         Get credits info with full robustness (curl_cffi, fallbacks).
         Migrated from SoraDriver.get_credits_api
+
+        A successful result is reused for _CREDITS_TTL seconds per access
+        token; a successful generation drops it.
         """
+        cached = self._credits_cache
+        if cached and cached[0] == self.access_token and time.monotonic() - cached[1] < _CREDITS_TTL:
+            return cached[2]
+
+        result = await self._fetch_credits_summary(device_id, sentinel_token)
+        if result and "credits" in result:
+            self._credits_cache = (self.access_token, time.monotonic(), result)
+        return result
+
+    async def _fetch_credits_summary(self, device_id: str = None, sentinel_token: str = None) -> Dict[str, Any]:
         # 1. Try curl_cffi with browser fingerprint (Primary)
         try:
             # Prepare headers for curl
@@ -284,70 +624,61 @@ class SoraApiClient:
             if device_id:
                 curl_headers["oai-device-id"] = device_id
             if sentinel_token:
-                 curl_headers['openai-sentinel-token'] = json.dumps(json.loads(sentinel_token) if isinstance(sentinel_token, str) else sentinel_token)
+                 curl_headers['openai-sentinel-token'] = sentinel_header(sentinel_token)
 
             logger.info(f"{self.log_prefix} [API] check_credits: Using curl_cffi for Cloudflare bypass...")
             
-            async with AsyncSession(impersonate="chrome120") as session:
-                # Priority 1: /nf/check
-                response = await session.get(
-                    "https://sora.chatgpt.com/backend/nf/check",
-                    headers=curl_headers,
-                    cookies=self.cookie_dict,  # FIX: Pass cookies explicitly
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        balance_info = data.get("rate_limit_and_credit_balance", {})
-                        estimated_remaining = balance_info.get("estimated_num_videos_remaining")
-                        purchased_remaining = balance_info.get("estimated_num_purchased_videos_remaining", 0)
-                        reset_seconds = balance_info.get("access_resets_in_seconds")
-                        
-                        if estimated_remaining is not None:
-                            total_credits = int(estimated_remaining) + int(purchased_remaining)
-                            return {
-                                "credits": total_credits, 
-                                "source": "curl_nf_check", 
-                                "reset_seconds": reset_seconds,
-                                "raw": data
-                            }
-                    except:
-                        pass
-                
-                # Priority 2: /billing/credit_balance
-                response = await session.get(
-                    "https://sora.chatgpt.com/backend/billing/credit_balance",
-                    headers=curl_headers,
-                    timeout=15
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if "credits" in data:
-                        return {"credits": int(data["credits"]), "source": "curl_billing"}
+            # Shared session; credits keep their chrome120 fingerprint per request
+            # Priority 1: /nf/check
+            _, data = await self._get_json(
+                "https://sora.chatgpt.com/backend/nf/check",
+                headers=curl_headers,
+                impersonate="chrome120",
+                timeout=30
+            )
+            
+            if data is not None:
+                try:
+                    balance_info = data.get("rate_limit_and_credit_balance", {})
+                    estimated_remaining = balance_info.get("estimated_num_videos_remaining")
+                    purchased_remaining = balance_info.get("estimated_num_purchased_videos_remaining", 0)
+                    reset_seconds = balance_info.get("access_resets_in_seconds")
+                    
+                    if estimated_remaining is not None:
+                        total_credits = int(estimated_remaining) + int(purchased_remaining)
+                        return {
+                            "credits": total_credits, 
+                            "source": "curl_nf_check", 
+                            "reset_seconds": reset_seconds,
+                            "raw": data
+                        }
+                except (ValueError, TypeError, AttributeError):
+                    pass
+            
+            # Priority 2: /billing/credit_balance
+            _, data = await self._get_json(
+                "https://sora.chatgpt.com/backend/billing/credit_balance",
+                headers=curl_headers,
+                impersonate="chrome120"
+            )
+            if isinstance(data, dict):
+                if "credits" in data:
+                    return {"credits": int(data["credits"]), "source": "curl_billing"}
 
-        except ImportError:
-            logger.warning("[API] curl_cffi not installed, skipping robust check")
         except Exception as e:
             logger.error(f"[API] specific credit check failed: {e}")
 
         # 2. Fallback to simple endpoint (if any, otherwise return empty)
-        return self._simple_get_credits()
+        return await self._simple_get_credits()
 
 
-    def _simple_get_credits(self) -> Optional[Dict]:
+    async def _simple_get_credits(self) -> Optional[Dict]:
         """Original simple implementation as fallback"""
         url = "https://sora.chatgpt.com/backend/api/credits/summary"
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                impersonate="chrome120",
-                timeout=15
-            )
-            if response.status_code == 200:
-                return response.json()
+            _, data = await self._get_json(url, impersonate="chrome120")
+            if data is not None:
+                return data
         except Exception:
             pass
         return {"error": "All credit checks failed"}
@@ -391,57 +722,58 @@ class SoraApiClient:
 
         headers = self.headers.copy()
         headers['Content-Type'] = 'application/json'
-        headers['openai-sentinel-token'] = json.dumps(json.loads(sentinel_token) if isinstance(sentinel_token, str) else sentinel_token)
+        headers['openai-sentinel-token'] = sentinel_header(sentinel_token)
         
         logger.info(f"📤 {self.log_prefix} [API] Posting video {video_id} (GenID: {generation_id})...")
 
         try:
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.post(
-                    url,
-                    headers=headers,
-                    json=payload,
-                    cookies=self.cookie_dict,
-                    timeout=30
-                )
+            response = await self._request_with_backoff(
+                "POST",
+                url,
+                headers=headers,
+                json=payload,
+                cookies=self.cookie_dict,
+                timeout=30,
+                retry_statuses=_POST_RETRY_STATUSES
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Log full response for debugging
-                    with open("post_response_debug.json", "w") as f:
-                        json.dump(data, f, indent=2)
+            if response.status_code == 200:
+                data = json_utils.loads(response.content)
+                # Log full response for debugging (serialize + write off the event loop)
+                await asyncio.to_thread(_write_debug_json, "post_response_debug.json", data)
+                
+                # Extract post ID and share_ref - check both direct and nested locations
+                post_id = data.get('id')
+                share_ref = data.get('share_ref')
+                if not post_id and 'post' in data:
+                    post_id = data['post'].get('id')
+                    share_ref = data['post'].get('share_ref')
+                
+                # CRITICAL FIX: Construct proper URL for dyysy.com compatibility
+                # Format: https://sora.chatgpt.com/p/{post_id}?psh={share_ref}
+                # Note: post_id may or may not have 's_' prefix - add if missing
+                share_url = None
+                if post_id:
+                    # Ensure post_id has correct format (force s_ prefix as required by external tools)
+                    formatted_id = post_id if post_id.startswith('s_') else f"s_{post_id}"
                     
-                    # Extract post ID and share_ref - check both direct and nested locations
-                    post_id = data.get('id')
-                    share_ref = data.get('share_ref')
-                    if not post_id and 'post' in data:
-                        post_id = data['post'].get('id')
-                        share_ref = data['post'].get('share_ref')
+                    # Construct URL with share_ref param
+                    share_url = f"https://sora.chatgpt.com/p/{formatted_id}"
+                    if share_ref:
+                        share_url += f"?psh={share_ref}"
                     
-                    # CRITICAL FIX: Construct proper URL for dyysy.com compatibility
-                    # Format: https://sora.chatgpt.com/p/{post_id}?psh={share_ref}
-                    # Note: post_id may or may not have 's_' prefix - add if missing
-                    share_url = None
-                    if post_id:
-                        # Ensure post_id has correct format (force s_ prefix as required by external tools)
-                        formatted_id = post_id if post_id.startswith('s_') else f"s_{post_id}"
-                        
-                        # Construct URL with share_ref param
-                        share_url = f"https://sora.chatgpt.com/p/{formatted_id}"
-                        if share_ref:
-                            share_url += f"?psh={share_ref}"
-                        
-                    if not share_url or not post_id:
-                        logger.error(f"{self.log_prefix} [ERROR] [API] Post succeeded but no post_id found in response")
-                        return {"success": False, "error": "No post_id in response"}
-                        
-                    logger.info(f"{self.log_prefix} [OK] [API] Video Published! ID: {post_id} | URL: {share_url}")
-                    return {"success": True, "post_id": post_id, "url": share_url, "share_ref": share_ref}
+                if not share_url or not post_id:
+                    logger.error(f"{self.log_prefix} [ERROR] [API] Post succeeded but no post_id found in response")
+                    return {"success": False, "error": "No post_id in response"}
+                    
+                logger.info(f"{self.log_prefix} [OK] [API] Video Published! ID: {post_id} | URL: {share_url}")
+                return {"success": True, "post_id": post_id, "url": share_url, "share_ref": share_ref}
 
 
-                else:
-                    logger.error(f"{self.log_prefix} [ERROR] [API] Post failed ({response.status_code}): {response.text}")
-                    return {"success": False, "error": f"{response.status_code} - {response.text}"}
+            else:
+                text = response.text
+                logger.error(f"{self.log_prefix} [ERROR] [API] Post failed ({response.status_code}): {text}")
+                return {"success": False, "error": f"{response.status_code} - {text}"}
 
         except Exception as e:
             logger.error(f"[ERROR] [API] Post exception: {e}")
@@ -453,43 +785,39 @@ class SoraApiClient:
         Checks matching post_id OR matching video_id in attachments (task_id/generation_id).
         """
         try:
-            async with AsyncSession(impersonate="chrome") as session:
-                response = await session.get(
-                    "https://sora.chatgpt.com/backend/project_y/profile_feed/me?limit=8&cut=nf2",
-                    headers=self.headers,
-                    cookies=self.cookie_dict,
-                    timeout=15
-                )
+            response, data = await self._get_json(
+                "https://sora.chatgpt.com/backend/project_y/profile_feed/me",
+                params={"limit": 8, "cut": "nf2"}
+            )
+            
+            if data is not None:
+                items = data.get('items', [])
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    items = data.get('items', [])
-                    
-                    target_post_id = post_id.replace("s_", "") if post_id else ""
+                target_post_id = post_id.replace("s_", "") if post_id else ""
+                
+                for item in items:
+                    post = item.get('post', {})
                     
-                    for item in items:
-                        post = item.get('post', {})
+                    # 1. Match Post ID
+                    current_post_id = post.get('id', "").replace("s_", "")
+                    if target_post_id and current_post_id == target_post_id:
+                        logger.info(f"{self.log_prefix} [OK] [VERIFY] Post {post_id} confirmed by Post ID!")
+                        return True
                         
-                        # 1. Match Post ID
-                        current_post_id = post.get('id', "").replace("s_", "")
-                        if target_post_id and current_post_id == target_post_id:
-                            logger.info(f"{self.log_prefix} [OK] [VERIFY] Post {post_id} confirmed by Post ID!")
-                            return True
-                            
-                        # 2. Match Video ID (Task/Gen ID) in Attachments
-                        if video_id:
-                            attachments = post.get('attachments', [])
-                            for att in attachments:
-                                if att.get('task_id') == video_id or att.get('generation_id') == video_id:
-                                    logger.info(f"{self.log_prefix} [OK] [VERIFY] Post confirmed by Video ID match ({video_id}) inside Post {current_post_id}")
-                                    return True
-                    
-                    logger.warning(f"{self.log_prefix} [WARNING] [VERIFY] Post/Video not found in feed.")
-                    return False
-                else:
-                    logger.warning(f"{self.log_prefix} [VERIFY] Feed check failed: {response.status_code}")
-                    return False
-                    
+                    # 2. Match Video ID (Task/Gen ID) in Attachments
+                    if video_id:
+                        attachments = post.get('attachments', [])
+                        for att in attachments:
+                            if att.get('task_id') == video_id or att.get('generation_id') == video_id:
+                                logger.info(f"{self.log_prefix} [OK] [VERIFY] Post confirmed by Video ID match ({video_id}) inside Post {current_post_id}")
+                                return True
+                
+                logger.warning(f"{self.log_prefix} [WARNING] [VERIFY] Post/Video not found in feed.")
+                return False
+            else:
+                logger.warning(f"{self.log_prefix} [VERIFY] Feed check failed: {response.status_code}")
+                return False
+                
         except Exception as e:
             logger.error(f"[VERIFY] Error checking feed: {e}")
             return False
@@ -0,0 +1,39 @@
+"""
+JSON helpers for driver hot paths (interception, polling).
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Serialize to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def dumpb(obj) -> bytes:
+    """Serialize to compact JSON bytes (request bodies)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def pretty(obj) -> str:
+    """Indented JSON for log output"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
@@ -1,10 +1,32 @@
 from typing import Optional, List
+import asyncio
+import json
 import logging
+import random
+import time
 from app.core.drivers.abstractions import APIOnlyDriver, VideoResult, CreditsInfo, UploadResult, VideoData, PendingTask
-from app.core.drivers.api_client import SoraApiClient
+from app.core.drivers.api_client import SoraApiClient, build_video_payload, extract_download_url
+from app.core.sentinel import aget_cached_sentinel_token, invalidate_sentinel_token, is_sentinel_error
 
 logger = logging.getLogger(__name__)
 
+# Duration (seconds) -> n_frames; unknown durations fall back to 180
+_DURATION_TO_FRAMES = {5: 150, 10: 300, 15: 450}
+# Aspect ratio -> Sora orientation; unknown ratios fall back to landscape
+_ASPECT_TO_ORIENTATION = {"16:9": "landscape", "9:16": "portrait", "1:1": "square"}
+# wait_for_completion polls often at first, then backs off (3s, 6s, 12s, ...) up to poll_interval
+_POLL_INITIAL = 3.0
+_POLL_BACKOFF = 2.0
+# Uploads/generations in flight at once in generate_video_batch
+_BATCH_CONCURRENCY = 8
+
+# A successful credits lookup is reused this long per access token
+_CREDITS_TTL = 10.0
+
+# Fixed failure results, shared (the dataclasses are frozen)
+_HEAVY_LOAD_EXHAUSTED = VideoResult(success=False, error="Sora server under heavy load after 3 retries")
+_RETRIES_EXHAUSTED = VideoResult(success=False, error="Unknown error after retries")
+
 class SoraApiDriver(APIOnlyDriver):
     """
     Sora Driver implementation that uses ONLY the API.
@@ -12,7 +34,10 @@ class SoraApiDriver(APIOnlyDriver):
     
     Implements: VideoGenerationDriver
     """
-    
+    # access token -> (CreditsInfo, fetched at). Workers build a fresh driver
+    # per task, so the cache lives on the class to absorb back-to-back checks
+    _credits_cache = {}
+
     def __init__(self, access_token: str, device_id: str = None, user_agent: str = None, cookies: list = None, account_email: str = None):
         super().__init__(access_token=access_token, device_id=device_id, user_agent=user_agent)
         self.cookies = cookies or []
@@ -28,13 +53,25 @@ class SoraApiDriver(APIOnlyDriver):
         )
         logger.info(f"🔌 SoraApiDriver initialized (Device ID: {self.device_id})")
 
+    @property
+    def cookies(self) -> list:
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, value: list):
+        # Callers re-inject cookies after construction; keep the client's
+        # prebuilt cookie header in sync instead of rebuilding it per call
+        self._cookies = value or []
+        if getattr(self, "api_client", None):
+            self.api_client.set_cookies(self._cookies)
+
     async def start(self) -> None:
         """No-op for API driver"""
         pass
 
     async def stop(self) -> None:
-        """No-op for API driver"""
-        pass
+        """Close the API client's pooled connections"""
+        await self.api_client.aclose()
 
     async def generate_video(
         self,
@@ -46,87 +83,97 @@ class SoraApiDriver(APIOnlyDriver):
         """
         Generate video via API with retry logic for heavy_load errors
         """
-        import asyncio
-        import random
-        import json
-
-        # Map duration to n_frames
-        duration_to_frames = {5: 150, 10: 300, 15: 450}
-        n_frames = duration_to_frames.get(duration, 180)
-
-        # Map aspect ratio to orientation
-        if aspect_ratio == "16:9":
-            orientation = "landscape"
-        elif aspect_ratio == "9:16":
-            orientation = "portrait"
-        elif aspect_ratio == "1:1":
-            orientation = "square"
-        else:
-            orientation = "landscape"  # Default fallback
-
         # Upload image if provided
         file_id = None
         if image_path:
-            upload_result = await self.upload_image(image_path)
+            # Warm the sentinel cache while the upload is in flight
+            upload_result, _ = await asyncio.gather(
+                self.upload_image(image_path),
+                aget_cached_sentinel_token(flow="sora_2_create_task"),
+                return_exceptions=True
+            )
+            if isinstance(upload_result, BaseException):
+                raise upload_result
             if not upload_result.success:
                 return VideoResult(success=False, error=upload_result.error)
             file_id = upload_result.file_id
 
+        return await self._generate(prompt, duration, aspect_ratio, file_id)
+
+    async def generate_video_batch(self, requests: List[dict]) -> List[VideoResult]:
+        """
+        Generate several videos, uploading all images first and then
+        submitting all generations, at most _BATCH_CONCURRENCY at a time.
+
+        Each request is a dict of generate_video() keyword arguments.
+        Results are returned in request order.
+        """
+        sem = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+        async def upload(image_path: Optional[str]) -> Optional[UploadResult]:
+            if not image_path:
+                return None
+            async with sem:
+                return await self.upload_image(image_path)
+
+        async def generate(req: dict, upload_result: Optional[UploadResult]) -> VideoResult:
+            if upload_result is not None and not upload_result.success:
+                return VideoResult(success=False, error=upload_result.error)
+            async with sem:
+                return await self._generate(
+                    req["prompt"],
+                    req["duration"],
+                    req["aspect_ratio"],
+                    upload_result.file_id if upload_result else None
+                )
+
+        uploads, _ = await asyncio.gather(
+            asyncio.gather(*(upload(req.get("image_path")) for req in requests)),
+            aget_cached_sentinel_token(flow="sora_2_create_task"),
+            return_exceptions=True
+        )
+        if isinstance(uploads, BaseException):
+            raise uploads
+        return list(await asyncio.gather(*(generate(req, u) for req, u in zip(requests, uploads))))
+
+    async def _generate(
+        self,
+        prompt: str,
+        duration: int,
+        aspect_ratio: str,
+        file_id: Optional[str]
+    ) -> VideoResult:
+        """Submit a generation for an already-uploaded (or absent) image"""
+        n_frames = _DURATION_TO_FRAMES.get(duration, 180)
+        orientation = _ASPECT_TO_ORIENTATION.get(aspect_ratio, "landscape")
+
         # Prepare Payload
-        from app.core.sentinel import get_sentinel_token
         try:
-            sentinel_payload = get_sentinel_token(flow="sora_2_create_task")
+            sentinel_payload = await aget_cached_sentinel_token(flow="sora_2_create_task")
         except Exception as e:
             return VideoResult(success=False, error=f"Sentinel failed: {e}")
 
         # Build COMPLETE payload matching old implementation
-        # CRITICAL: Sora API requires ALL fields, even if None
-        payload = {
-            "kind": "video",
-            "prompt": prompt,
-            "title": None,
-            "orientation": orientation,
-            "size": "small",  # BUG FIX: This was missing! Default: "small"
-            "n_frames": n_frames,
-            "inpaint_items": [],
-            "remix_target_id": None,
-            "metadata": None,
-            "cameo_ids": None,
-            "cameo_replacements": None,
-            "model": "sy_8",
-            "style_id": None,
-            "audio_caption": None,
-            "audio_transcript": None,
-            "video_caption": None,
-            "storyboard_id": None
-        }
-
-        if file_id:
-            # Smart extraction: If file_id contains #, find the part starting with 'file_'
-            clean_id = file_id
-            if "#" in file_id:
-                parts = file_id.split("#")
-                for p in parts:
-                    if p.startswith("file_"):
-                         clean_id = p
-                         break
-            
-            payload["inpaint_items"] = [{"kind": "file", "file_id": clean_id}]
+        # CRITICAL: Sora API requires ALL fields, even if None (see build_video_payload)
+        payload = build_video_payload(prompt, orientation, n_frames, file_id=file_id)
 
-        # Retry logic for heavy_load errors
+        # Retry logic for heavy_load errors (plus one retry for a stale sentinel)
         max_retries = 3
-        for attempt in range(1, max_retries + 1):
+        sentinel_refreshed = False
+        attempt = 1
+        while attempt <= max_retries:
             logger.info(f"[API] Generate attempt {attempt}/{max_retries}")
 
             # Call API Client
             result = await self.api_client.generate_video(
                 payload=payload,
                 sentinel_token=sentinel_payload,
-                device_id=self.device_id or ""
+                device_id=self.device_id
             )
 
             if result.get("success"):
-                # Success!
+                # Success! The generation just spent credits
+                SoraApiDriver._credits_cache.pop(self.access_token, None)
                 return VideoResult(
                     success=True,
                     task_id=result.get("task_id"),
@@ -136,6 +183,17 @@ class SoraApiDriver(APIOnlyDriver):
             # Failed - check error type
             error_str = str(result.get("error", ""))
 
+            if not sentinel_refreshed and is_sentinel_error(error_str):
+                # Cached token was rejected - regenerate and retry once
+                sentinel_refreshed = True
+                invalidate_sentinel_token("sora_2_create_task")
+                try:
+                    sentinel_payload = await aget_cached_sentinel_token(flow="sora_2_create_task")
+                except Exception as e:
+                    return VideoResult(success=False, error=f"Sentinel failed: {e}")
+                # Same attempt again - the stale token doesn't count against max_retries
+                continue
+
             # Check if it's a heavy_load error
             is_heavy_load = False
             try:
@@ -155,11 +213,12 @@ class SoraApiDriver(APIOnlyDriver):
                     delay = random.randint(15, 30)
                     logger.warning(f"[API] Heavy load detected. Retry {attempt}/{max_retries} after {delay}s...")
                     await asyncio.sleep(delay)
+                    attempt += 1
                     continue
                 else:
                     # Max retries reached for heavy_load
                     logger.error(f"[API] Max retries reached for heavy_load. Giving up.")
-                    return VideoResult(success=False, error="Sora server under heavy load after 3 retries")
+                    return _HEAVY_LOAD_EXHAUSTED
 
             # Parse error_code early to check for specific error types
             parsed_error_code = None
@@ -192,6 +251,7 @@ class SoraApiDriver(APIOnlyDriver):
                      task_prompt = task.get("prompt", "")
                      if prompt[:50].strip() in task_prompt:
                          logger.info(f"[API] ✅ Verification SUCCESS! Found matching task {task.get('id')}")
+                         SoraApiDriver._credits_cache.pop(self.access_token, None)
                          return VideoResult(
                              success=True,
                              task_id=task.get("id"),
@@ -220,22 +280,20 @@ class SoraApiDriver(APIOnlyDriver):
             )
 
         # Should not reach here, but just in case
-        return VideoResult(
-            success=False,
-            error="Unknown error after retries"
-        )
+        return _RETRIES_EXHAUSTED
 
     async def get_credits(self) -> CreditsInfo:
         """
-        Get credits via API
+        Get credits via API, reusing a lookup from the last _CREDITS_TTL seconds
         """
-        # Generate sentinel if possible
+        cached = SoraApiDriver._credits_cache.get(self.access_token)
+        if cached and time.monotonic() - cached[1] < _CREDITS_TTL:
+            return cached[0]
+
+        # Generate sentinel if possible (the client serializes the header)
         sentinel_token = ""
         try:
-            from app.core.sentinel import get_sentinel_token
-            import json
-            token_data = get_sentinel_token(flow="sora_2_create_task")
-            sentinel_token = json.dumps(json.loads(token_data) if isinstance(token_data, str) else token_data)
+            sentinel_token = await aget_cached_sentinel_token(flow="sora_2_create_task")
         except Exception:
             pass
 
@@ -251,10 +309,17 @@ class SoraApiDriver(APIOnlyDriver):
                 error_code=result.get("error_code")
              )
 
-        return CreditsInfo(
+        info = CreditsInfo(
             credits=result.get("credits"),
             reset_seconds=result.get("reset_seconds")
         )
+        now = time.monotonic()
+        cache = SoraApiDriver._credits_cache
+        # Tokens rotate - drop expired entries so the map stays small
+        for token in [t for t, (_, at) in cache.items() if now - at >= _CREDITS_TTL]:
+            del cache[token]
+        cache[self.access_token] = (info, now)
+        return info
 
     async def upload_image(self, image_path: str) -> UploadResult:
         """Upload image via API"""
@@ -277,17 +342,23 @@ class SoraApiDriver(APIOnlyDriver):
              # Fallback log if we ever support prompt-only waiting
             logger.info(f"[WAIT]  Waiting for video completion (API) - Prompt: '{match_prompt[:30]}...' (NO task_id)")
 
-        import time
-        import asyncio
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        # Short generations finish between early polls; long ones back off
+        # towards poll_interval instead of hitting the API at a fixed rate
+        delay = min(_POLL_INITIAL, poll_interval)
+        max_delay = poll_interval
+        # A just-submitted task starts out pending; drafts are skipped until it leaves
+        was_pending = True
+
+        while time.monotonic() < deadline:
             try:
+                # One refresh_state call per tick; drafts ride along once the task left pending
+                _, pending, drafts = await self.api_client.refresh_state(include_drafts=not was_pending)
+
                 # 1. Check Pending
-                pending = await self.api_client.get_pending_tasks()
+                is_pending = False
                 if pending:
                     # Check if our task is still pending
-                    is_pending = False
                     for task in pending:
                         # PRIORITY 1: Match by task_id (exact match)
                         if task_id and task.get("id") == task_id:
@@ -304,15 +375,13 @@ class SoraApiDriver(APIOnlyDriver):
                                 logger.info(f"[STATS]  Task still pending (prompt match): {progress:.1f}% complete")
                                 is_pending = True
                                 break
-                
-                    if is_pending:
-                         await asyncio.sleep(poll_interval)
-                         continue
-
-                # 2. Check Drafts (Finished)
-                # Use robust get_drafts from Client
-                drafts = await self.api_client.get_drafts(limit=15)
-                if drafts:
+
+                # 2. Check Drafts (Finished) - only once the task has left pending
+                was_pending = is_pending
+                if not is_pending and drafts is None:
+                    # Left pending since the last tick - drafts weren't requested yet
+                    drafts = await self.api_client.get_drafts(limit=15)
+                if drafts and not is_pending:
                     for draft in drafts:
                         # PRIORITY 1: Match by task_id
                         if task_id and draft.get("task_id") == task_id:
@@ -332,7 +401,7 @@ class SoraApiDriver(APIOnlyDriver):
                                 )
 
                             # Check for download URL
-                            download_url = draft.get("url") or draft.get("downloadable_url") or draft.get("video_url")
+                            download_url = extract_download_url(draft)
                             if download_url:
                                 return VideoData(
                                     id=draft.get("id"),
@@ -362,7 +431,7 @@ class SoraApiDriver(APIOnlyDriver):
                                         error=error_msg  # Pass specific error
                                     )
 
-                                download_url = draft.get("url") or draft.get("downloadable_url") or draft.get("video_url")
+                                download_url = extract_download_url(draft)
                                 if download_url:
                                      return VideoData(
                                         id=draft.get("id"),
@@ -374,10 +443,12 @@ class SoraApiDriver(APIOnlyDriver):
             except Exception as e:
                 logger.warning(f"[API] Poll error in wait_for_completion: {e}")
             
-            elapsed = int(time.time() - start_time)
-            # logger.info(f"[WAIT]  Polling... ({elapsed}s / {timeout}s)")
-            await asyncio.sleep(poll_interval)
-            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * _POLL_BACKOFF, max_delay)
+
         return None
 
     async def get_pending_tasks(self) -> List[PendingTask]:
@@ -385,13 +456,13 @@ class SoraApiDriver(APIOnlyDriver):
         raw_tasks = await self.api_client.get_pending_tasks()
         if not raw_tasks:
             return []
-            
-        tasks = []
-        for t in raw_tasks:
-            tasks.append(PendingTask(
+
+        return [
+            PendingTask(
                 id=t.get("id", ""),
                 status=t.get("status", "pending"),
                 progress_pct=t.get("progress_pct"),
                 created_at=t.get("created_at")
-            ))
-        return tasks
+            )
+            for t in raw_tasks
+        ]
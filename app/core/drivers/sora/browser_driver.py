@@ -1,56 +1,253 @@
 from app.core.drivers.abstractions import BrowserBasedDriver, VideoResult, CreditsInfo, UploadResult, VideoData, PendingTask
-from .pages.login import SoraLoginPage
-from .pages.creation import SoraCreationPage
-from .pages.drafts import SoraDraftsPage
-from .pages.download import SoraDownloadPage
-from .pages.verification import SoraVerificationPage
+from app.core.drivers.api_client import SoraApiClient, build_video_payload, extract_download_url
+from app.core.drivers import json_utils
+from app.core.sentinel import aget_cached_sentinel_token, invalidate_sentinel_token, is_sentinel_error
 import logging
 import asyncio
 import aiohttp
 import os
 import time
-import json
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from functools import cached_property
+from urllib.parse import urlsplit
 from typing import Optional, Callable, Awaitable
 
 logger = logging.getLogger(__name__)
 
+# Intercepted bodies above this size are not worth pulling into Python
+_MAX_INTERCEPT_BODY = 5_000_000
+
+# LRU bound for the interception cache of long-running drivers
+_MAX_INTERCEPTED_VIDEOS = 2048
+# Intercepted entries not refreshed for this long are stale (seconds)
+_INTERCEPTED_VIDEO_TTL = 3600
+
+# How long data the page itself fetched stays a valid answer for *_api calls
+_INTERCEPTED_CREDITS_TTL = 30
+_INTERCEPTED_PENDING_TTL = 10
+
+# Completion polling: start quick, back off per miss, stay quick near the end
+_POLL_INITIAL = 3
+_POLL_BACKOFF = 1.5
+_POLL_MAX = 30
+_POLL_NEAR_DONE = 5
+
+# Prompt-prefix -> task ID lookup built from the last pending list
+_PENDING_INDEX_TTL = 5
+_PENDING_PREFIX_LEN = 20
+
+# A creation page that just submitted is still on Sora past Cloudflare; skip re-navigating
+_CREATION_PAGE_WARM_TTL = 60
+
+# Credits only change when we submit; reuse a successful lookup this long
+_CREDITS_TTL = 30
+
+# A browser context stays logged in as the same user; re-check /me after this
+_IDENTITY_TTL = 900
+
+# A remembered access token is reused at login only with this much validity left
+_TOKEN_MIN_TTL = 60
+
+# Fixed failure results, shared (the dataclasses are frozen)
+_NO_TOKEN_CREDITS = CreditsInfo(credits=None, error="No access token")
+_SESSION_EXPIRED = VideoResult(success=False, error="Session expired (Redirected to Login)")
+_CLOUDFLARE_TIMED_OUT = VideoResult(success=False, error="Cloudflare challenge timed out")
+_UI_SUBMIT_FAILED = VideoResult(success=False, error="UI interaction failed (Click Generate)")
+_TASK_ID_NOT_CAPTURED = VideoResult(success=False, error="Video submitted but failed to capture Task ID for tracking.")
+
+# Only first-party requests can carry the tokens we capture
+_URL_PREFIXES = (
+    "https://chatgpt.com",
+    "https://sora.chatgpt.com",
+    "https://api.openai.com",
+    "https://sora.com",
+)
+
+# Static assets on first-party hosts never carry the bearer token
+_STATIC_RESOURCE_TYPES = frozenset(("image", "font", "stylesheet", "media"))
+
+_ME_URL = "https://chatgpt.com/backend-api/me"
+_POST_URL = "https://sora.chatgpt.com/backend/project_y/post"
+
+# Transient statuses worth retrying a publish on. 502/504 are left out: the
+# post may already have gone through and a retry would publish twice.
+_RETRY_STATUSES = (429, 503)
+_RETRY_ATTEMPTS = 4
+_RETRY_MAX_DELAY = 10
+# Transport failures of a direct call - anything else is a bug and propagates.
+# ValueError covers an unparseable (non-JSON) body.
+_HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+# Default budget for every request on the shared aiohttp session
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Cloudflare's challenge page names itself in <title>, well inside the first KB
+_CF_MARKER = b"Just a moment"
+_CF_SCAN_BYTES = 1024
+
+# Publish headers that never change; per-call auth/sentinel/device are merged on top
+_POST_STATIC_HEADERS = {"Content-Type": "application/json", "oai-language": "en-US"}
+
+# Injected into every document before page scripts run
+_STEALTH_JS = (
+    "if (Object.getOwnPropertyDescriptor(navigator,'webdriver')===undefined){"
+    "Object.defineProperty(navigator,'webdriver',{get:()=>undefined});}"
+)
+
+# In-page scripts are static; per-call values travel as evaluate() arguments
+_ME_JS = """async (url) => {
+    try {
+        const res = await fetch(url, {
+            headers: { 'Content-Type': 'application/json' }
+        });
+        if (res.status === 200) {
+            const data = await res.json();
+            return { status: 200, email: data.email };
+        }
+        return { status: res.status, email: null };
+    } catch (e) {
+        return { status: 0, email: null, error: e.toString() };
+    }
+}"""
+
+_POST_JS = """async ({ url, body, headers }) => {
+    const oaiDeviceId = localStorage.getItem('oai-did') || null;
+    try {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { ...headers, 'oai-device-id': oaiDeviceId },
+            body
+        });
+
+        if (response.ok) {
+            return { status: response.status, data: await response.json() };
+        }
+        return { status: response.status, body: await response.text() };
+    } catch (e) {
+        return { status: 0, error: e.toString() };
+    }
+}"""
+
+
+# One regex pass decides both "is this a Sora endpoint we parse" and its type.
+# Plain "create" matches are still parsed but classified as unknown.
+_SORA_ENDPOINT_RE = re.compile(r"sora\.chatgpt\.com/.*?(profile/drafts|feed|tasks|nf/create|nf/pending|create)")
+_ENDPOINT_TYPES = {
+    "profile/drafts": "DRAFTS",
+    "feed": "FEED",
+    "tasks": "TASKS",
+    "nf/create": "SUBMISSION",
+    "nf/pending": "PENDING",
+}
+
+
+def _match_endpoint(url: str) -> Optional[str]:
+    """Endpoint type of an intercepted Sora URL, or None if it isn't one we parse"""
+    m = _SORA_ENDPOINT_RE.search(url)
+    if not m:
+        return None
+    return _ENDPOINT_TYPES.get(m.group(1), "unknown")
+
+
+def _classify_endpoint(url: str) -> str:
+    """Map an intercepted Sora URL to the endpoint type used for caching/logging"""
+    return _match_endpoint(url) or "unknown"
+
+
+def _cookie_applies(cookie: dict, host: str, path: str) -> bool:
+    """Whether a context cookie would be sent to host/path (domain + path match)"""
+    domain = cookie.get("domain", "")
+    if domain.startswith("."):
+        if host != domain[1:] and not host.endswith(domain):
+            return False
+    elif host != domain:
+        return False
+    cookie_path = cookie.get("path") or "/"
+    return path.startswith(cookie_path)
+
+
+def _norm_email(email: Optional[str]) -> str:
+    """Canonical form used for every identity comparison"""
+    return (email or "").strip().casefold()
+
+
+def _is_blocked_error(error) -> bool:
+    """Whether an API client failure ("<status> - <body>") was a 403 or Cloudflare challenge"""
+    error = str(error or "")
+    return error.startswith("403") or _CF_MARKER.decode() in error
+
+
 class SoraBrowserDriver(BrowserBasedDriver):
-    def __init__(self, headless: bool = False, proxy: Optional[str] = None, user_data_dir: Optional[str] = None, channel: str = "chrome", access_token: str = None, device_id: str = None, user_agent: str = None, cookies: list = None, account_email: str = None):
+    # (cookie digest, normalized email) -> verified at; shared by drivers in this
+    # process so a re-created driver on the same session skips the /me check
+    _verified_identities = {}
+    # normalized email -> (Bearer token, exp) of the last token captured for that
+    # user; lets a later login start with a live token instead of waiting for one
+    _captured_tokens = {}
+
+    def __init__(self, headless: bool = False, proxy: Optional[str] = None, user_data_dir: Optional[str] = None, channel: str = "chrome", access_token: str = None, device_id: str = None, user_agent: str = None, cookies: list = None, account_email: str = None, max_concurrent_api: int = 4):
         super().__init__(headless=headless, proxy=proxy, user_data_dir=user_data_dir, channel=channel)
         
         # Store auth data if provided (Hybrid/API support)
         self.latest_access_token = access_token
-        self.device_id = device_id
+        self.device_id = device_id or "" # Always a str - no per-use fallbacks needed
         self.latest_user_agent = user_agent
         self.cookies = cookies or []
         self.account_email = account_email
+        self._expected_email = account_email # Raw email the session should belong to
+        self._expected_email_norm = _norm_email(account_email)
+
+        # Interception cache (populated passively once the browser is started)
+        self.intercepted_videos = OrderedDict() # ID / task ID -> {status, url, ...} (LRU)
+        self._intercepted_credits = None # Credits dict derived from the last submission
+        self._intercepted_credits_at = 0.0
+        self._intercepted_credits_token = None # Access token the page used for that submission
+        self._intercepted_pending = None # Last nf/pending list the page fetched
+        self._intercepted_pending_at = 0.0
+        self._pending_prefix_index = {} # prompt[:20] -> task ID
+        self._pending_prefix_index_at = 0.0
+        self._identity_cache = {} # id(context) -> (normalized email, verified at)
+        self._identity_digest = None # Cookie digest of the last identity check
+        self._credits_cache = None # (access token, CreditsInfo, fetched at) of the last successful lookup
+
+        self._creation_page_ready_at = 0.0 # Last successful click_generate (monotonic)
+        self._inflight_calls = {} # single-flight key -> running Task
+        self._task_futures = {} # task ID -> Future resolved by interception on completion/failure
+        self._jwt_claims_cache = {} # access token -> (email claim, exp claim), None if absent
+        self._cached_device_id = None # oai-did read from localStorage, kept until logout
+        # Signalled by _on_request_intercept once a Bearer token is captured. Created
+        # here (not in start) so waiters survive a restart and never hit AttributeError
+        self._token_event = asyncio.Event()
+        self._cookie_version = 0 # Bumped whenever the cookie jar may have changed
+        self._cookies_cache = None # (id(context), cookie version, cookies)
+        self._cookie_header_cache = {} # url -> (id(context), cookie version, Cookie header)
+        self._bg_tasks = set() # Fire-and-forget cleanup; stop() drains it before closing the context
 
         # Use direct auth URL for reliable login flow
         self.base_url = "https://chatgpt.com/auth/login?next=%2Fsora%2F"
         
-        # Page Objects (initialized after start)
-        self.login_page = None
-        self.creation_page = None
-        self.drafts_page = None
-        self.download_page = None
-        self.verification_page = None
+        # Page objects are cached properties, built on first use (see _reset_page_objects)
         
+        # Caps in-page API fetches sharing the single CDP channel of self.page
+        self._api_sem = asyncio.Semaphore(max_concurrent_api)
+
+        # Keep-alive HTTP session for direct calls (created lazily, closed in stop())
+        self._http: Optional[aiohttp.ClientSession] = None
+
         # API Client (SOLID Refactor)
         self.api_client = None
-        if self.latest_access_token:
-            from app.core.drivers.api_client import SoraApiClient
-            self.api_client = SoraApiClient(
-                access_token=self.latest_access_token, 
-                user_agent=self.latest_user_agent or "Mozilla/5.0",
-                cookies=self.cookies,
-                account_email=self.account_email,
-                device_id=self.device_id
-            )
+        self._ensure_api_client()
 
     async def start(self):
         """Start browser and initialize driver"""
         from playwright.async_api import async_playwright
 
+        # A new page is about to be created; don't reuse objects bound to an old one
+        self._reset_page_objects()
+        self._reset_context_caches()
+
         # Initialize Playwright
         self.playwright = await async_playwright().start()
 
@@ -77,9 +274,15 @@ class SoraBrowserDriver(BrowserBasedDriver):
             "--disable-infobars",
             "--disable-dev-shm-usage",
             "--disable-extensions",
-            "--disable-gpu",
             "--disable-web-security",
             "--disable-site-isolation-trials",
+            "--disable-features=Translate,BackForwardCache",
+            # Keep the Sora tab at full speed when it is not in the foreground
+            "--disable-background-timer-throttling",
+            "--disable-backgrounding-occluded-windows",
+            "--disable-renderer-backgrounding",
+            "--no-first-run",
+            "--no-default-browser-check",
         ]
 
         # Use provided profile dir or default
@@ -113,13 +316,7 @@ class SoraBrowserDriver(BrowserBasedDriver):
         self.page = await self.context.new_page()
 
         # Add stealth script
-        await self.page.add_init_script("""
-            if (Object.getOwnPropertyDescriptor(navigator, 'webdriver') === undefined) {
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            }
-        """)
+        await self.page.add_init_script(_STEALTH_JS)
 
         # Setup Hybrid Interception
         # Preserve injected tokens if available
@@ -129,30 +326,69 @@ class SoraBrowserDriver(BrowserBasedDriver):
              self.latest_user_agent = None
              
         self.latest_intercepted_data = None
-        self.intercepted_videos = {} # ID -> {status, url, ...}
+        self.intercepted_videos = OrderedDict() # ID -> {status, url, ...} (LRU)
         self.last_submission_result = None # Latest nf/create response
+        self._task_id_event = asyncio.Event() # Set once last_submission_result is captured
+        self._inflight_parse = {} # endpoint_type -> newest response queued behind the running parse (or None)
+
+        # Reflect an injected token; interception signals later captures
+        if self.latest_access_token:
+            self._token_event.set()
+        else:
+            self._token_event.clear()
         await self._setup_interception()
 
-        self.login_page = SoraLoginPage(self.page)
-        self.creation_page = SoraCreationPage(self.page)
-        self.drafts_page = SoraDraftsPage(self.page)
-        self.download_page = SoraDownloadPage(self.page)
-        self.verification_page = SoraVerificationPage(self.page)
+    # ========== Page Objects ==========
+    # Built on first access and bound to the current self.page. The page
+    # modules are imported here so API-only consumers never load them.
+
+    _PAGE_OBJECTS = ("login_page", "creation_page", "drafts_page", "download_page", "verification_page")
+
+    @cached_property
+    def login_page(self):
+        from .pages.login import SoraLoginPage
+        return SoraLoginPage(self.page)
+
+    @cached_property
+    def creation_page(self):
+        from .pages.creation import SoraCreationPage
+        return SoraCreationPage(self.page)
+
+    @cached_property
+    def drafts_page(self):
+        from .pages.drafts import SoraDraftsPage
+        return SoraDraftsPage(self.page)
+
+    @cached_property
+    def download_page(self):
+        from .pages.download import SoraDownloadPage
+        return SoraDownloadPage(self.page)
+
+    @cached_property
+    def verification_page(self):
+        from .pages.verification import SoraVerificationPage
+        return SoraVerificationPage(self.page)
+
+    def _reset_page_objects(self):
+        """Drop cached page objects so the next access binds to the current page"""
+        for name in self._PAGE_OBJECTS:
+            self.__dict__.pop(name, None)
+
+    def _reset_context_caches(self):
+        """
+        Drop caches keyed by id(context). A new context can reuse a collected
+        one's id(), which would hand it the old identity or cookie jar.
+        """
+        self._identity_cache.clear()
+        self._cookies_cache = None
+        self._cookie_header_cache.clear()
+        self._cookie_version += 1
 
     async def login(self, email: str, password: str):
         """
         Performs the login flow.
         """
-        if not self.login_page:
-            self.login_page = SoraLoginPage(self.page)
-        
         await self.login_page.login(email, password, self.base_url, headless_mode=self.headless)
-        
-        # Initialize other pages after successful login
-        self.creation_page = SoraCreationPage(self.page)
-        self.drafts_page = SoraDraftsPage(self.page)
-        self.download_page = SoraDownloadPage(self.page)
-        self.verification_page = SoraVerificationPage(self.page)
 
     async def wait_for_login(self, timeout: int = 300) -> Optional[str]:
         """
@@ -164,49 +400,108 @@ class SoraBrowserDriver(BrowserBasedDriver):
         Returns:
             Detected email string if successful, None otherwise.
         """
-        logger.info(f"👤 Waiting for USER to login (max {timeout}s)...")
+        logger.info("👤 Waiting for USER to login (max %ss)...", timeout)
         
         # Navigate to login if not already there
         if "auth/login" not in self.page.url and "sora" not in self.page.url:
              await self.page.goto(self.base_url, wait_until="domcontentloaded")
 
-        start_time = time.time()
-        poll_interval = 2
-        
-        import jwt
-        
-        while time.time() - start_time < timeout:
-            if self.latest_access_token:
-                # Try to decode email
-                try:
-                    token_str = self.latest_access_token
-                    if token_str.lower().startswith("bearer "):
-                        token_str = token_str[7:]
-                    
-                    decoded = jwt.decode(token_str, options={"verify_signature": False})
-                    
-                    email = None
-                    if "email" in decoded:
-                        email = decoded["email"]
-                    elif "https://api.openai.com/profile" in decoded:
-                        email = decoded["https://api.openai.com/profile"].get("email")
-                    elif "user" in decoded and isinstance(decoded["user"], dict):
-                        email = decoded["user"].get("email")
-                        
-                    if email:
-                        logger.info(f"✨ Token captured for email: {email}")
-                        return email
-                except Exception as e:
-                    pass
+        deadline = time.monotonic() + timeout
 
-            await asyncio.sleep(poll_interval)
-            
-        return None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._token_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+            email = self._email_from_token(self.latest_access_token)
+            if email:
+                logger.info("✨ Token captured for email: %s", email)
+                self._remember_token()
+                return email
+
+            # Token carried no email - wait for the next one
+            self._token_event.clear()
 
 
     
+    def _email_from_token(self, token: Optional[str]) -> Optional[str]:
+        """Email claim of a captured access token (None when it has none)"""
+        return self._token_claims(token)[0]
+
+    def _token_claims(self, token: Optional[str]) -> tuple:
+        """
+        (email, exp) claims of a captured access token.
+
+        The interceptor re-signals the same token on every request, so
+        decodes are memoized per token string (None for a missing claim).
+        """
+        if not token:
+            return None, None
+        if token in self._jwt_claims_cache:
+            return self._jwt_claims_cache[token]
+
+        import jwt
+
+        email = exp = None
+        try:
+            token_str = token[7:] if token.lower().startswith("bearer ") else token
+            decoded = jwt.decode(token_str, options={"verify_signature": False})
+
+            if "email" in decoded:
+                email = decoded["email"]
+            elif "https://api.openai.com/profile" in decoded:
+                email = decoded["https://api.openai.com/profile"].get("email")
+            elif "user" in decoded and isinstance(decoded["user"], dict):
+                email = decoded["user"].get("email")
+            exp = decoded.get("exp")
+        except Exception:
+            pass
+
+        self._jwt_claims_cache[token] = (email, exp)
+        return email, exp
+
+    def _remember_token(self) -> None:
+        """Record the current token under the user it was issued to"""
+        email, exp = self._token_claims(self.latest_access_token)
+        if email and exp:
+            SoraBrowserDriver._captured_tokens[_norm_email(email)] = (self.latest_access_token, exp)
+
+    def _restore_token(self, email: str) -> bool:
+        """Adopt a remembered, still-valid token for email; True if one was used"""
+        entry = SoraBrowserDriver._captured_tokens.get(_norm_email(email))
+        if not entry:
+            return False
+        token, exp = entry
+        if exp - time.time() <= _TOKEN_MIN_TTL:
+            SoraBrowserDriver._captured_tokens.pop(_norm_email(email), None)
+            return False
+        self.latest_access_token = token
+        if self.api_client:
+            self.api_client.set_access_token(token)
+        return True
+
     async def stop(self):
         """Stop driver and cleanup resources"""
+        for task in list(self._inflight_calls.values()):
+            task.cancel()
+        self._inflight_calls.clear()
+        for fut in self._task_futures.values():
+            fut.cancel()
+        self._task_futures.clear()
+        self._reset_page_objects()
+        self._reset_context_caches()
+        if self._bg_tasks:
+            # Cookie clearing must land before a persistent profile is closed
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        if self.api_client:
+            await self.api_client.aclose()
+        if self._http and not self._http.closed:
+            await self._http.close()
+        self._http = None
         if self.context:
             await self.context.close()
         if self.browser:
@@ -214,9 +509,99 @@ class SoraBrowserDriver(BrowserBasedDriver):
         if self.playwright:
             await self.playwright.stop()
 
+    @property
+    def cookies(self) -> list:
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, value: list):
+        # Callers re-inject cookies after construction; keep the client's
+        # prebuilt cookie header in sync instead of rebuilding it per call
+        self._cookies = value or []
+        if getattr(self, "api_client", None):
+            self.api_client.set_cookies(self._cookies)
+
+    def _ensure_api_client(self) -> Optional[SoraApiClient]:
+        """
+        Build the API client on first use.
+
+        The token may arrive after construction (via interception), so every
+        *_api helper calls this instead of building the client itself.
+        """
+        if not self.api_client and self.latest_access_token:
+            self.api_client = SoraApiClient(
+                access_token=self.latest_access_token,
+                user_agent=self.latest_user_agent or "Mozilla/5.0",
+                cookies=self.cookies,
+                account_email=self.account_email,
+                device_id=self.device_id
+            )
+        return self.api_client
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so repeated calls reuse TCP+TLS connections"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                ),
+                timeout=_HTTP_TIMEOUT,
+                json_serialize=json_utils.dumps
+            )
+        return self._http
+
+    def _invalidate_identity_cache(self):
+        """Forget verified identities (cookies cleared or auth rejected)"""
+        self._identity_cache.clear()
+        if self._identity_digest:
+            shared = SoraBrowserDriver._verified_identities
+            for key in [k for k in shared if k[0] == self._identity_digest]:
+                del shared[key]
+        # A rejected token must not be handed to the next login either
+        tokens = SoraBrowserDriver._captured_tokens
+        for key in [k for k, v in tokens.items() if v[0] == self.latest_access_token]:
+            del tokens[key]
+
+    async def _cookie_digest(self) -> str:
+        """Short digest of the chatgpt.com cookies identifying the logged-in session"""
+        header = await self._get_cookie_header("https://chatgpt.com")
+        self._identity_digest = hashlib.blake2b(header.encode(), digest_size=8).hexdigest()
+        return self._identity_digest
+
+    def _normalized_email(self, email: str) -> str:
+        """Normalized email, reusing the value precomputed at login"""
+        if email == self._expected_email:
+            return self._expected_email_norm
+        return _norm_email(email)
+
     def get_cached_video(self, video_id: str) -> Optional[dict]:
         """Get video info from interception cache"""
-        return self.intercepted_videos.get(video_id)
+        entry = self.intercepted_videos.get(video_id)
+        if entry is None:
+            return None
+        if asyncio.get_running_loop().time() - entry.get("last_updated", 0) > _INTERCEPTED_VIDEO_TTL:
+            del self.intercepted_videos[video_id]
+            return None
+        self.intercepted_videos.move_to_end(video_id)
+        return entry
+
+    def _touch_intercepted(self, key: str):
+        """Mark a cache key as most recently used and evict stale/oldest entries beyond the bounds"""
+        videos = self.intercepted_videos
+        videos.move_to_end(key)
+        while len(videos) > _MAX_INTERCEPTED_VIDEOS:
+            videos.popitem(last=False)
+
+        # Least recently touched entries sit at the front; drop them once stale
+        cutoff = asyncio.get_running_loop().time() - _INTERCEPTED_VIDEO_TTL
+        while videos:
+            oldest_key = next(iter(videos))
+            if videos[oldest_key].get("last_updated", 0) >= cutoff:
+                break
+            del videos[oldest_key]
 
     async def _setup_interception(self):
         """Setup network listener to capture tokens"""
@@ -242,6 +627,11 @@ class SoraBrowserDriver(BrowserBasedDriver):
         """Callback for every request"""
         try:
             url = request.url
+            if not url.startswith(_URL_PREFIXES):
+                return
+            if request.resource_type in _STATIC_RESOURCE_TYPES:
+                return
+
             if "nf/create" in url and request.method == "POST":
                 try:
                     logger.info("====== 🕵️ CAPTURED GENERATION REQUEST ======")
@@ -253,24 +643,26 @@ class SoraBrowserDriver(BrowserBasedDriver):
                 except Exception as e:
                     logger.warning(f"Failed to log request body: {e}")
 
-            # Widen scope to capture token from ANY OpenAI/ChatGPT endpoint
-            if "openai.com" in url or "chatgpt.com" in url:
-                # print(f"🕵️ INTERCEPTED URL: {url}") # Explicit print to see in console
-                headers = request.headers
-                
-                # Check for standard Authorization header (case-insensitive in Playwright headers)
-                # Playwright headers are lowercase
-                token = headers.get("authorization")
-                
-                if token and token.startswith("Bearer "):
-                    if self.latest_access_token != token:
-                        logger.info(f"[TOKEN]  Captured NEW Access Token! ({token[:15]}...) via {url}")
-                        self.latest_access_token = token
-                        
-                        # Also capture User-Agent from this request if available
-                        if "user-agent" in headers:
-                            self.latest_user_agent = headers["user-agent"]
-                            
+            # Capture token from ANY OpenAI/ChatGPT endpoint
+            headers = request.headers
+
+            # Check for standard Authorization header (case-insensitive in Playwright headers)
+            # Playwright headers are lowercase
+            token = headers.get("authorization")
+
+            if token and token[0] == "B" and token.startswith("Bearer "):
+                if self.latest_access_token != token:
+                    logger.info(f"[TOKEN]  Captured NEW Access Token! ({token[:15]}...) via {url}")
+                    self.latest_access_token = token
+                    if self.api_client:
+                        # Keep the client's prebuilt headers on the live token
+                        self.api_client.set_access_token(token)
+                    self._token_event.set()
+
+                    # Also capture User-Agent from this request if available
+                    if "user-agent" in headers:
+                        self.latest_user_agent = headers["user-agent"]
+
         except Exception as e:
             pass # Don't crash on intercept
 
@@ -278,37 +670,57 @@ class SoraBrowserDriver(BrowserBasedDriver):
         """Callback for every response - Fire and Forget"""
         try:
             url = response.url
+            # Session bounced to login - the creation page is no longer usable as-is
+            if "auth/login" in url:
+                self._creation_page_ready_at = 0.0
+                self._cached_device_id = None
+            # Playwright hides Set-Cookie from response.headers; documents and
+            # auth endpoints are where the jar actually changes
+            if "/api/auth/" in url or response.request.resource_type == "document":
+                self._cookie_version += 1
             # Filter for relevant JSON endpoints
-            if "sora.chatgpt.com" in url and ("profile/drafts" in url or "feed" in url or "tasks" in url or "create" in url):
+            endpoint_type = _match_endpoint(url)
+            if endpoint_type:
                 if response.status == 200 and "application/json" in response.headers.get("content-type", ""):
+
+                     # Debounce bursts (pagination/revalidation): one parse per endpoint
+                     # type at a time, latest wins - a response arriving mid-parse replaces
+                     # any queued one and is parsed next. Submissions carry the task ID,
+                     # never queue them.
+                     if endpoint_type != "SUBMISSION":
+                         if endpoint_type in self._inflight_parse:
+                             self._inflight_parse[endpoint_type] = response
+                             return
+                         self._inflight_parse[endpoint_type] = None
+
                      # We cannot await here directly effectively if not async handler, 
                      # but Playwright handlers can be regular functions.
                      # To read body, we need to handle it carefully.
                      # PROPER WAY: Schedule a background task to read it to not block the handler?
                      # Actually, page.on handler CAN be async.
-                     asyncio.create_task(self._process_response_body(response))
+                     asyncio.create_task(self._process_response_body(response, endpoint_type))
         except Exception as e:
             pass
 
-    async def _process_response_body(self, response):
+    async def _process_response_body(self, response, endpoint_type: str = None):
         """Async helper to read response body"""
         try:
-            data = await response.json()
+            content_length = int(response.headers.get("content-length") or 0)
+            if content_length > _MAX_INTERCEPT_BODY:
+                return
+
+            data = json_utils.loads(await response.body())
+            if not isinstance(data, (dict, list)):
+                return
             url = response.url
             
             # Identify endpoint type
-            endpoint_type = "unknown"
-            if "profile/drafts" in url: endpoint_type = "DRAFTS"
-            elif "feed" in url: endpoint_type = "FEED"
-            elif "tasks" in url: endpoint_type = "TASKS"
-            elif "nf/create" in url: endpoint_type = "SUBMISSION"
-            
-            # Log full response for debugging (as requested by user)
-            logger.info(f"[TASK]  Intercepted {endpoint_type} JSON ({len(str(data))} bytes)")
-            
+            if endpoint_type is None:
+                endpoint_type = _classify_endpoint(url)
+
             if endpoint_type == "SUBMISSION":
                  logger.info(f"====== 🕵️ SUBMISSION RESPONSE ({url}) ======")
-                 logger.info(json.dumps(data, indent=2)) # Log full JSON
+                 logger.info(json_utils.pretty(data)) # Log full JSON
                  logger.info("==========================================")
             else:
                  # For others, keep brief or log full if needed. User asked for "logs toàn bộ".
@@ -321,6 +733,7 @@ class SoraBrowserDriver(BrowserBasedDriver):
             if endpoint_type == "SUBMISSION":
                 # Parse submission result for credits
                 self.last_submission_result = data
+                self._task_id_event.set()
                 logger.info("[OK]  Captured SUBMISSION response!")
                 
                 # [NEW] Log Payload & Headers for Debugging/Syncing API Driver
@@ -340,47 +753,85 @@ class SoraBrowserDriver(BrowserBasedDriver):
                     daily_creds = balance.get("estimated_num_videos_remaining")
                     reset_secs = balance.get("access_resets_in_seconds")
                     logger.info(f"[CREDITS]  Credits Remaining: {daily_creds} | Reset in: {reset_secs}s")
-            
-            # Parse and cache items
-            items = []
-            if "items" in data: items = data["items"]
-            elif isinstance(data, list): items = data
-            
-            if items:
-                logger.info(f"   Found {len(items)} items in {endpoint_type}")
-                for item in items:
-                    # Extract key info
-                    vid_id = item.get("id")
-                    if not vid_id: continue
-                    
-                    # Normalize Status
-                    # In drafts JSON, status might be inferred from 'url' presence or specific fields
-                    # If 'url' is present and valid, it's likely 'complete' or 'ready'
-                    # If 'processing_status' exists, use it.
-                    status = item.get("status", "unknown")
-                    download_url = item.get("url")
-                    
-                    # Drafts API often returns 'url' even if processing? verify
-                    # Usually "url" is the result video.
-                    # If it has a URL, we treat it as potentially downloadable.
-                    
-                    if vid_id not in self.intercepted_videos:
-                        self.intercepted_videos[vid_id] = {}
-                        
-                    self.intercepted_videos[vid_id].update({
-                        "id": vid_id,
-                        "status": status,
-                        "download_url": download_url,
-                        "prompt": item.get("prompt"),
-                        "last_updated": asyncio.get_event_loop().time()
-                    })
-                    
-                    # Logging specific
-                    # logger.info(f"   - Cached {vid_id}: {status} | URL: {bool(download_url)}")
+
+                    if daily_creds is not None:
+                        purchased = balance.get("estimated_num_purchased_videos_remaining") or 0
+                        self._intercepted_credits = {
+                            "credits": int(daily_creds) + int(purchased),
+                            "source": "intercepted_submission",
+                            "reset_seconds": reset_secs
+                        }
+                        self._intercepted_credits_at = time.monotonic()
+                        self._intercepted_credits_token = self.latest_access_token
+
+            if endpoint_type == "PENDING" and isinstance(data, list):
+                self._intercepted_pending = data
+                self._intercepted_pending_at = time.monotonic()
+
+            # Parse and cache items (status dicts without items stop here)
+            items = data.get("items") if isinstance(data, dict) else data
+            if not items:
+                return
+
+            # Log full response for debugging (as requested by user)
+            logger.info(f"[TASK]  Intercepted {endpoint_type} JSON ({response.headers.get('content-length', '?')} bytes)")
+
+            logger.info(f"   Found {len(items)} items in {endpoint_type}")
+            now = asyncio.get_running_loop().time()
+            for item in items:
+                get = item.get
+                # Extract key info
+                vid_id = get("id")
+                if not vid_id: continue
+                
+                # Normalize Status
+                # In drafts JSON, status might be inferred from 'url' presence or specific fields
+                # If 'url' is present and valid, it's likely 'complete' or 'ready'
+                # If 'processing_status' exists, use it.
+                status = get("status", "unknown")
+                download_url = get("url")
+                
+                # Drafts API often returns 'url' even if processing? verify
+                # Usually "url" is the result video.
+                # If it has a URL, we treat it as potentially downloadable.
+                
+                task_ref = get("task_id")
+                entry = self.intercepted_videos.get(vid_id)
+                if entry is None:
+                    entry = self.intercepted_videos[vid_id] = {}
+                entry["id"] = vid_id
+                entry["task_id"] = task_ref
+                entry["status"] = status
+                entry["download_url"] = download_url
+                entry["prompt"] = get("prompt")
+                entry["last_updated"] = now
+                self._touch_intercepted(vid_id)
+
+                # Drafts reference their originating task - index by it too
+                # so pollers can look up completion by task_id
+                if task_ref and task_ref != vid_id:
+                    self.intercepted_videos[task_ref] = entry
+                    self._touch_intercepted(task_ref)
+
+                # Wake anyone waiting on this task
+                if download_url or status == "failed":
+                    for key in (task_ref, vid_id):
+                        fut = self._task_futures.pop(key, None) if key else None
+                        if fut and not fut.done():
+                            fut.set_result(dict(entry))
+                
+                # Logging specific
+                # logger.info(f"   - Cached {vid_id}: {status} | URL: {bool(download_url)}")
 
         except Exception as e:
             # logger.warning(f"[WARNING]  Failed to parse intercepted JSON from {response.url}: {e}")
             pass
+        finally:
+            queued = self._inflight_parse.pop(endpoint_type, None)
+            if queued is not None:
+                # Parse the newest response that arrived while this one ran
+                self._inflight_parse[endpoint_type] = None
+                asyncio.create_task(self._process_response_body(queued, endpoint_type))
 
     async def wait_for_completion_api(self, match_prompt: str, timeout: int = 600, task_id: Optional[str] = None) -> Optional[dict]:
         """
@@ -400,43 +851,62 @@ class SoraBrowserDriver(BrowserBasedDriver):
         else:
             logger.info(f"[WAIT]  Waiting for video completion (API) - Prompt: '{match_prompt[:30]}...' (NO task_id - using fuzzy match)")
 
+        needle = match_prompt[:30].strip()  # Prompt-fallback substring, computed once
         start_time = time.time()
-        poll_interval = 15  # Poll every 15 seconds
+        poll_interval = _POLL_INITIAL  # Backs off per miss; interception wakes us early
 
-        while time.time() - start_time < timeout:
-            try:
-                # 1. Check pending tasks first
-                pending = await self.get_pending_tasks_api()
-                if pending is not None:
-                    # Check if our task is still pending
-                    is_pending = False
-                    for task in pending:
-                        # PRIORITY 1: Match by task_id (exact match)
-                        if task_id and task.get("id") == task_id:
-                            progress = (task.get("progress_pct") or 0) * 100
-                            logger.info(f"[STATS]  Task {task_id} still pending: {progress:.1f}% complete")
-                            is_pending = True
-                            break
+        try:
+            while time.time() - start_time < timeout:
+                # 0. Passive interception may already have seen the finished draft
+                if task_id:
+                    cached = self.get_cached_video(task_id)
+                    if cached and cached.get("download_url"):
+                        logger.info(f"[OK]  Video completed (intercepted)! Task ID: {task_id}")
+                        return {
+                            "id": cached.get("id"),
+                            "task_id": task_id,
+                            "download_url": cached["download_url"],
+                            "prompt": cached.get("prompt"),
+                            "status": "completed"
+                        }
 
-                        # FALLBACK: Match by prompt (fuzzy - less reliable)
-                        if not task_id:
-                            task_prompt = task.get("prompt", "")
-                            if match_prompt[:30].strip() in task_prompt or task_prompt[:30].strip() in match_prompt:
-                                progress = (task.get("progress_pct") or 0) * 100
+                try:
+                    # 1. Check pending first - drafts are only fetched once the task left it
+                    pending = await self.get_pending_tasks_api()
+                    if pending is not None:
+                        # Check if our task is still pending
+                        if task_id:
+                            # PRIORITY 1: Match by task_id (exact match)
+                            matched = next((t for t in pending if t.get("id") == task_id), None)
+                            if matched is not None:
+                                progress_pct = matched.get("progress_pct") or 0
+                                logger.info(f"[STATS]  Task {task_id} still pending: {progress_pct * 100:.1f}% complete")
+
+                                # Close to done - don't let backoff overshoot the finish
+                                if progress_pct > 0.7:
+                                    poll_interval = min(poll_interval, _POLL_NEAR_DONE)
+                        else:
+                            # FALLBACK: Match by prompt (fuzzy - less reliable)
+                            matched = next(
+                                (t for t in pending
+                                 if needle in t.get("prompt", "") or t.get("prompt", "")[:30].strip() in match_prompt),
+                                None
+                            )
+                            if matched is not None and logger.isEnabledFor(logging.INFO):
+                                progress = (matched.get("progress_pct") or 0) * 100
                                 logger.info(f"[STATS]  Task still pending (prompt match): {progress:.1f}% complete")
-                                is_pending = True
-                                break
-
-                    # If not in pending, check drafts for completion
-                    if not is_pending or len(pending) == 0:
-                        # Use get_drafts_api() with curl_cffi instead of _api_get_drafts() with aiohttp
-                        # to bypass Cloudflare protection
-                        drafts = await self.get_drafts_api()
-                        if drafts:
-                            for draft in drafts:
+                        is_pending = matched is not None
+
+                        # If not in pending, check drafts for completion
+                        if not is_pending or len(pending) == 0:
+                            # Use get_drafts_api() with curl_cffi instead of _api_get_drafts()
+                            # with aiohttp to bypass Cloudflare protection
+                            drafts = await self.get_drafts_api()
+                            if drafts and task_id:
                                 # PRIORITY 1: Match by task_id (exact match)
-                                if task_id and draft.get("task_id") == task_id:
-                                    download_url = draft.get("url") or draft.get("downloadable_url") or draft.get("video_url")
+                                draft = next((d for d in drafts if d.get("task_id") == task_id), None)
+                                if draft:
+                                    download_url = extract_download_url(draft)
                                     if download_url:
                                         logger.info(f"[OK]  Video completed! Task ID: {task_id}")
                                         return {
@@ -450,11 +920,12 @@ class SoraBrowserDriver(BrowserBasedDriver):
                                         logger.warning(f"[ERROR]  Video generation failed for task {task_id}")
                                         return {"status": "failed", "id": draft.get("id"), "task_id": task_id}
 
+                            elif drafts:
                                 # FALLBACK: Match by prompt (less reliable)
-                                if not task_id:
+                                for draft in drafts:
                                     draft_prompt = draft.get("prompt", "")
-                                    if match_prompt[:30].strip() in draft_prompt or draft_prompt[:30].strip() in match_prompt:
-                                        download_url = draft.get("url") or draft.get("downloadable_url") or draft.get("video_url")
+                                    if needle in draft_prompt or draft_prompt[:30].strip() in match_prompt:
+                                        download_url = extract_download_url(draft)
                                         if download_url:
                                             logger.warning(f"[WARNING]  Video matched by PROMPT (no task_id)! ID: {draft.get('id')}")
                                             return {
@@ -467,37 +938,96 @@ class SoraBrowserDriver(BrowserBasedDriver):
                                             logger.warning(f"[ERROR]  Video generation failed (prompt match)")
                                             return {"status": "failed", "id": draft.get("id")}
 
-            except Exception as e:
-                logger.warning(f"API poll error: {e}")
+                except Exception as e:
+                    logger.warning(f"API poll error: {e}")
+
+                elapsed = int(time.time() - start_time)
+                logger.info(f"[WAIT]  Polling... ({elapsed}s / {timeout}s)")
+                interval = poll_interval
+                poll_interval = min(poll_interval * _POLL_BACKOFF, _POLL_MAX)
+                if not task_id:
+                    await asyncio.sleep(interval)
+                    continue
+
+                # Sleep until the next poll, unless interception sees the task finish first
+                entry = await self._wait_task_signal(task_id, interval)
+                if entry:
+                    if entry.get("status") == "failed" and not entry.get("download_url"):
+                        logger.warning(f"[ERROR]  Video generation failed for task {task_id} (intercepted)")
+                        return {"status": "failed", "id": entry.get("id"), "task_id": task_id}
+                    logger.info(f"[OK]  Video completed (intercepted)! Task ID: {task_id}")
+                    return {
+                        "id": entry.get("id"),
+                        "task_id": task_id,
+                        "download_url": entry["download_url"],
+                        "prompt": entry.get("prompt"),
+                        "status": "completed"
+                    }
+
+            logger.error(f"[ERROR]  Timeout waiting for video completion after {timeout}s")
+            return None
+        finally:
+            # Drop our wake-up future however we exit (result, timeout or cancellation)
+            if task_id:
+                self._task_futures.pop(task_id, None)
 
-            elapsed = int(time.time() - start_time)
-            logger.info(f"[WAIT]  Polling... ({elapsed}s / {timeout}s)")
-            await asyncio.sleep(poll_interval)
 
-        logger.error(f"[ERROR]  Timeout waiting for video completion after {timeout}s")
-        return None
 
+    async def _wait_task_signal(self, task_id: str, timeout: float) -> Optional[dict]:
+        """
+        Wait up to timeout for interception to report task_id finished.
+
+        Returns the intercepted entry, or None if nothing arrived in time.
+        """
+        fut = self._task_futures.get(task_id)
+        if fut is None or fut.done():
+            fut = asyncio.get_running_loop().create_future()
+            self._task_futures[task_id] = fut
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _single_flight(self, key, factory):
+        """
+        Run factory() once for concurrent callers sharing the same key.
 
+        Callers that arrive while a call is in flight await the same task
+        instead of issuing their own request. Cancelling one caller does not
+        cancel the shared call.
+        """
+        task = self._inflight_calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight_calls[key] = task
+
+            def _done(t, key=key):
+                if self._inflight_calls.get(key) is t:
+                    del self._inflight_calls[key]
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
 
     async def get_credits_api(self) -> dict:
         """
         Check credits via SoraApiClient.
         Delegates robust check to the API client.
         """
-        if not self.api_client:
-             if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-             else:
-                return {"error": "No access token", "error_code": "NO_TOKEN"}
+        return await self._single_flight("credits", self._get_credits_api)
+
+    async def _get_credits_api(self) -> dict:
+        # Credits reported by a submission the page just made are fresh enough
+        if (self._intercepted_credits
+                and self._intercepted_credits_token == self.latest_access_token
+                and time.monotonic() - self._intercepted_credits_at < _INTERCEPTED_CREDITS_TTL):
+            return self._intercepted_credits
+
+        if not self._ensure_api_client():
+            return {"error": "No access token", "error_code": "NO_TOKEN"}
 
         # Generate sentinel if possible (kept for compatibility with migrated logic)
         sentinel_token = ""
         try:
-            from app.core.sentinel import get_sentinel_token
-            import json
-            token_data = get_sentinel_token(flow="sora_2_create_task")
-            sentinel_token = json.dumps(json.loads(token_data) if isinstance(token_data, str) else token_data)
+            sentinel_token = await aget_cached_sentinel_token(flow="sora_2_create_task")
         except Exception:
              pass
 
@@ -516,27 +1046,43 @@ class SoraBrowserDriver(BrowserBasedDriver):
         Get list of pending video generation tasks with progress.
         Delegates to SoraApiClient.
         """
-        if not self.api_client and self.latest_access_token:
-             from ..api_client import SoraApiClient
-             self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent or "Mozilla/5.0", self.cookies)
-        
-        if self.api_client:
-            return await self.api_client.get_pending_tasks()
-            
-        return None
+        return await self._single_flight("pending", self._get_pending_tasks_api)
+
+    async def _get_pending_tasks_api(self) -> list:
+        # The Sora UI polls nf/pending itself - reuse its answer while fresh
+        if self._intercepted_pending is not None and time.monotonic() - self._intercepted_pending_at < _INTERCEPTED_PENDING_TTL:
+            result = self._intercepted_pending
+        elif self._ensure_api_client():
+            result = await self.api_client.get_pending_tasks()
+        else:
+            return None
+
+        if isinstance(result, list):
+            self._index_pending(result)
+        return result
+
+    def _index_pending(self, tasks: list):
+        """Rebuild the prompt-prefix -> task ID index from a pending list"""
+        self._pending_prefix_index = {
+            t["prompt"][:_PENDING_PREFIX_LEN]: t.get("id")
+            for t in tasks
+            if isinstance(t, dict) and t.get("prompt")
+        }
+        self._pending_prefix_index_at = time.monotonic()
+
+    def _lookup_pending_by_prompt(self, prompt: str) -> Optional[str]:
+        """Task ID for a prompt from the pending index, if the index is fresh"""
+        if time.monotonic() - self._pending_prefix_index_at >= _PENDING_INDEX_TTL:
+            return None
+        return self._pending_prefix_index.get(prompt[:_PENDING_PREFIX_LEN])
         
     async def get_drafts_api(self) -> list:
         """
         Get list of draft videos via SoraApiClient.
         """
-        if not self.api_client:
-            # Try to init if token available now
-            if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-            else:
-                 logger.warning("[WARNING] No API Client (missing token) for get_drafts")
-                 return None
+        if not self._ensure_api_client():
+            logger.warning("[WARNING] No API Client (missing token) for get_drafts")
+            return None
 
         # Use API Client
         return await self.api_client.get_drafts(limit=15)
@@ -553,59 +1099,36 @@ class SoraBrowserDriver(BrowserBasedDriver):
         """
         Generate video via SoraApiClient.
         """
-        from app.core.sentinel import get_sentinel_token
-        
-        if not self.api_client:
-             if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-             else:
-                return {"success": False, "error": "No access token / API Client"}
+        if not self._ensure_api_client():
+            return {"success": False, "error": "No access token / API Client"}
 
         # 1. Get Sentinel Token
         try:
-            sentinel_payload = get_sentinel_token(flow="sora_2_create_task")
+            sentinel_payload = await aget_cached_sentinel_token(flow="sora_2_create_task")
         except Exception as e:
             return {"success": False, "error": f"Sentinel failed: {e}"}
 
-        # 2. Build Payload
-        payload = {
-            "kind": "video",
-            "prompt": prompt,
-            "title": None,
-            "orientation": orientation,
-            "size": size,
-            "n_frames": n_frames,
-            "inpaint_items": [],
-            "remix_target_id": None,
-            "metadata": None,
-            "cameo_ids": None,
-            "cameo_replacements": None,
-            "model": model,
-            "style_id": None,
-            "audio_caption": None,
-            "audio_transcript": None,
-            "video_caption": None,
-            "storyboard_id": None
-        }
-
-        # Add image attachment if provided
-        if image_file_id:
-            clean_id = image_file_id
-            if "#" in clean_id:
-                parts = clean_id.split("#")
-                for p in parts:
-                    if p.startswith("file_") or p.startswith("file-"):
-                        clean_id = p
-                        break
-            payload["inpaint_items"] = [{"kind": "file", "file_id": clean_id}]
+        # 2. Build Payload (image attachment added when provided)
+        payload = build_video_payload(prompt, orientation, n_frames, size=size, model=model, file_id=image_file_id)
 
         # 3. Call API Client
-        return await self.api_client.generate_video(
+        device_id = await self._get_device_id()
+        result = await self.api_client.generate_video(
             payload=payload, 
             sentinel_token=sentinel_payload,
-            device_id=self.device_id or ""
+            device_id=device_id
         )
+        if not result.get("success") and is_sentinel_error(result.get("error")):
+            # Cached token was rejected - retry once with a fresh one
+            invalidate_sentinel_token("sora_2_create_task")
+            result = await self.api_client.generate_video(
+                payload=payload,
+                sentinel_token=await aget_cached_sentinel_token(flow="sora_2_create_task"),
+                device_id=device_id
+            )
+        if result.get("success"):
+            self._credits_cache = None
+        return result
 
 
 
@@ -613,170 +1136,279 @@ class SoraBrowserDriver(BrowserBasedDriver):
         """
         Upload image via SoraApiClient.
         """
-        if not self.api_client:
-             if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-             else:
-                return {"success": False, "error": "No access token for upload"}
+        if not self._ensure_api_client():
+            return {"success": False, "error": "No access token for upload"}
 
         return await self.api_client.upload_image(image_path)
-                
-
-
-    async def get_drafts_api(self) -> list:
-        """
-        Get list of draft videos via SoraApiClient.
-        """
-        if not self.api_client:
-            # Try to init if token available now
-            if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-            else:
-                 logger.warning("[WARNING] No API Client (missing token) for get_drafts")
-                 return None
-
-        # Use API Client
-        # Use API Client
-        return await self.api_client.get_drafts(limit=15)
-            
 
     async def post_video_api(self, video_id: str = None, title: str = None, description: str = None) -> dict:
         """
         Publish/post a video via API with sentinel bypass.
         Works in both browser and API-only mode.
         """
-        from app.core.sentinel import get_sentinel_token
-        import json
-        
-        logger.info(f"📤 Publishing video via API...")
+        logger.info("📤 Publishing video via API...")
         
         if not self.latest_access_token:
             return {"success": False, "error": "No access token"}
         
         # Initialize API Client if not ready
-        if not self.api_client:
-             if self.latest_access_token:
-                from ..api_client import SoraApiClient
-                self.api_client = SoraApiClient(self.latest_access_token, self.latest_user_agent, self.cookies)
-        
+        self._ensure_api_client()
+
         # Generate sentinel token for post flow
         try:
-            sentinel_payload = get_sentinel_token(flow="sora_2_create_post")
+            sentinel_payload = await aget_cached_sentinel_token(flow="sora_2_create_post")
         except Exception as e:
             return {"success": False, "error": f"Sentinel failed: {e}"}
             
         # 1. Try via API Client (curl_cffi - Robust)
         if self.api_client:
-            return await self.api_client.post_video(
+            result = await self.api_client.post_video(
                 video_id=video_id,
                 title=title,
                 description=description,
                 sentinel_token=sentinel_payload
             )
-
-        # 2. Fallback to Browser Context if API Client fails to init (Unlikely if token exists)
+            if not result.get("success") and is_sentinel_error(result.get("error")):
+                # Cached token was rejected - retry once with a fresh one
+                invalidate_sentinel_token("sora_2_create_post")
+                result = await self.api_client.post_video(
+                    video_id=video_id,
+                    title=title,
+                    description=description,
+                    sentinel_token=await aget_cached_sentinel_token(flow="sora_2_create_post")
+                )
+            if result.get("success"):
+                self._credits_cache = None
+            if result.get("success") or not self.page or not _is_blocked_error(result.get("error")):
+                return result
+            logger.info("[API] Post via API client was blocked, retrying with the browser's session")
+
+        # 2. Fallback to Browser Context when the API client is missing or blocked
         if self.page:
+            payload = {
+                "title": title or "Sora Video",
+                "description": description or "",
+                "visibility": "public"
+            }
+            if video_id:
+                payload["video_id"] = video_id
+
+            # 2a. Direct HTTP with the browser's cookies (no renderer round trip)
+            result = await self._post_video_http(payload, sentinel_payload)
+            if result is not None:
+                return result
+
+            # 2b. In-page fetch (passes Cloudflare with the real browser)
             try:
-                # determine Device ID
-                oai_device_id = await self.page.evaluate("""() => {
-                    return localStorage.getItem('oai-did') || null;
-                }""")
-                
-                payload = {
-                    "title": title or "Sora Video",
-                    "description": description or "",
-                    "visibility": "public"
-                }
-                if video_id:
-                    payload["video_id"] = video_id
-            
-                js_code = f"""
-                async () => {{
-                    const sentinelPayload = {sentinel_payload};
-                    
-                    try {{
-                        const response = await fetch('https://sora.chatgpt.com/backend/project_y/post', {{
-                            method: 'POST',
-                            headers: {{
-                                'Content-Type': 'application/json',
-                                'Authorization': '{self.latest_access_token}',
-                                'openai-sentinel-token': JSON.stringify(sentinelPayload),
-                                'oai-device-id': '{oai_device_id}',
-                                'oai-language': 'en-US'
-                            }},
-                            body: JSON.stringify({json.dumps(payload)})
-                        }});
-                        
-                        const text = await response.text();
-                        return {{ status: response.status, body: text }};
-                    }} catch (e) {{
-                        return {{ status: 0, error: e.toString() }};
-                    }}
-                }}
-                """
-                result = await self.page.evaluate(js_code)
-                
+                # One round trip: device ID lookup and publish together
+                async with self._api_sem:
+                    result = await self.page.evaluate(_POST_JS, {
+                        "url": _POST_URL,
+                        "body": json_utils.dumps(payload),
+                        "headers": {
+                            **_POST_STATIC_HEADERS,
+                            "Authorization": self.latest_access_token,
+                            "openai-sentinel-token": sentinel_payload
+                        }
+                    })
+
                 if result.get('status') == 200:
-                    data = json.loads(result['body'])
-                    logger.info(f"[OK]  Video Published! URL: {data.get('url')}")
+                    data = result.get('data') or {}
+                    logger.info("[OK]  Video Published! URL: %s", data.get('url'))
                     return {"success": True, "post_id": data.get('id'), "url": data.get('url')}
                 else:
+                     if result.get('status') in (401, 403):
+                         self._invalidate_identity_cache()
                      error_msg = result.get('body', result.get('error'))
-                     logger.error(f"[ERROR]  Post API failed (Browser): {error_msg}")
+                     logger.error("[ERROR]  Post API failed (Browser): %s", error_msg)
                      return {"success": False, "error": error_msg}
 
             except Exception as e:
-                logger.error(f"[ERROR]  post_video_api (Browser) exception: {e}")
+                logger.error("[ERROR]  post_video_api (Browser) exception: %s", e)
                 return {"success": False, "error": str(e)}
         
         return {"success": False, "error": "No API Client and No Browser Page active"}
 
+    async def _post_video_http(self, payload: dict, sentinel_payload: str) -> Optional[dict]:
+        """
+        Publish over the shared aiohttp session using the browser context's cookies.
+
+        Returns None when Cloudflare or auth rejects the request, or the
+        connection never opened, so the caller can retry through the real
+        browser. Once the POST may have gone out (timeout, disconnect, bad
+        body) a failure is returned instead - retrying could publish twice.
+        """
+        device_id = await self._get_device_id()
+        headers = {
+            **_POST_STATIC_HEADERS,
+            "Authorization": self.latest_access_token,
+            "User-Agent": self.latest_user_agent or "Mozilla/5.0",
+            "Cookie": await self._get_cookie_header(),
+            "openai-sentinel-token": sentinel_payload,
+            "oai-device-id": device_id or ""
+        }
+
+        try:
+            # Serialized once (orjson) and reused by every retry; Content-Type is in the headers
+            status, body = await self._post_with_retry(_POST_URL, data=json_utils.dumps(payload), headers=headers)
+            if status in (401, 403) or _CF_MARKER in body[:_CF_SCAN_BYTES]:
+                logger.info("[API] Direct post blocked (%s), falling back to browser fetch", status)
+                return None
+
+            if status == 200:
+                data = json_utils.loads(body)
+                logger.info("[OK]  Video Published! URL: %s", data.get('url'))
+                return {"success": True, "post_id": data.get('id'), "url": data.get('url')}
+
+            error = body.decode(errors="replace")
+            logger.error("[ERROR]  Post API failed (HTTP %s): %s", status, error)
+            return {"success": False, "error": error}
+
+        except aiohttp.ClientConnectorError as e:
+            logger.warning("[WARNING]  Direct post could not connect, falling back to browser fetch: %s", e)
+            return None
+        except _HTTP_ERRORS as e:
+            # The request may have reached the backend; don't publish again in the page
+            logger.error("[ERROR]  Direct post failed after sending: %r", e)
+            return {"success": False, "error": f"Post outcome unknown: {e!r}"}
+
+    async def _get_device_id(self) -> Optional[str]:
+        """
+        Device ID for API headers: the configured one, else the page's oai-did.
+
+        The localStorage read costs a CDP round-trip and the value is fixed
+        for the session, so it is read once and reused until logout.
+        """
+        if self.device_id:
+            return self.device_id
+        if self._cached_device_id is None and self.page:
+            async with self._api_sem:
+                self._cached_device_id = await self.page.evaluate("() => localStorage.getItem('oai-did') || null")
+        return self._cached_device_id
+
+    async def _post_with_retry(self, url: str, **kwargs) -> tuple:
+        """
+        POST over the shared session, retrying rate limits and overload.
+
+        Backs off exponentially with jitter (honouring Retry-After) on the
+        statuses in _RETRY_STATUSES; any other status is returned at once.
+        A failed connect is retried the same way - nothing was sent, so it
+        cannot double-publish. Other transport errors propagate.
+
+        Returns:
+            (status, raw body bytes) of the last response
+        """
+        session = self._get_http_session()
+        for attempt in range(_RETRY_ATTEMPTS):
+            last_attempt = attempt == _RETRY_ATTEMPTS - 1
+            retry_after = ""
+            try:
+                async with session.post(url, **kwargs) as response:
+                    body = await response.read()
+                    if response.status not in _RETRY_STATUSES or last_attempt:
+                        return response.status, body
+                    retry_after = response.headers.get("Retry-After", "")
+                    reason = response.status
+            except aiohttp.ClientConnectorError as e:
+                if last_attempt:
+                    raise
+                reason = e
+
+            delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt + random.random()
+            delay = min(delay, _RETRY_MAX_DELAY)
+            logger.warning("[API] %s failed (%s), retrying in %.1fs (%s/%s)", url, reason, delay, attempt + 1, _RETRY_ATTEMPTS)
+            await asyncio.sleep(delay)
+
+    async def _fetch_me(self) -> dict:
+        """
+        GET /me directly over the shared keep-alive session.
+
+        Sends the context's (cached) cookies only, so /me reports the user
+        logged in to this profile rather than whoever owns the captured
+        token. Only a Cloudflare challenge sends us back to an in-page fetch.
+        """
+        headers = {
+            "Accept": "application/json",
+            "Cookie": await self._get_cookie_header("https://chatgpt.com"),
+            "User-Agent": self.latest_user_agent or "Mozilla/5.0"
+        }
+
+        try:
+            async with self._get_http_session().get(_ME_URL, headers=headers) as response:
+                status = response.status
+                body = await response.read()
+            if status == 200:
+                data = json_utils.loads(body)
+                return {"status": 200, "email": data.get("email")}
+            if status != 403 or _CF_MARKER not in body[:_CF_SCAN_BYTES]:
+                return {"status": status, "email": None}
+            logger.info("[API] /me hit Cloudflare challenge, retrying in page")
+        except _HTTP_ERRORS as e:
+            logger.debug("[API] Direct /me failed, retrying in page: %s", e)
+
+        return await self.page.evaluate(_ME_JS, _ME_URL)
+
     async def verify_identity(self, expected_email: str) -> bool:
         """
         STRICT SECURITY CHECK:
         Verifies that the current browser session is actually logged in as 'expected_email'.
         Prevents 'Cross-Account' pollution if profiles get mixed up.
         """
-        logger.info(f"🆔 Verifying Identity (Expected: {expected_email})...")
-        
+        key = ("identity", id(self.page.context), self._normalized_email(expected_email))
+        return await self._single_flight(key, lambda: self._verify_identity(expected_email))
+
+    async def _verify_identity(self, expected_email: str) -> bool:
+        logger.info("🆔 Verifying Identity (Expected: %s)...", expected_email)
+        expected_norm = self._normalized_email(expected_email)
+
+        # Same context already verified as this user recently
+        cache_key = id(self.page.context)
+        cached = self._identity_cache.get(cache_key)
+        if cached and time.monotonic() - cached[1] < _IDENTITY_TTL:
+            if cached[0] == expected_norm:
+                logger.info("[OK]  Identity Verified (cached).")
+                return True
+
+        # Same cookies verified as this user by another driver instance
+        shared_key = None
+        try:
+            shared_key = (await self._cookie_digest(), expected_norm)
+            verified_at = SoraBrowserDriver._verified_identities.get(shared_key)
+            if verified_at and time.monotonic() - verified_at < _IDENTITY_TTL:
+                logger.info("[OK]  Identity Verified (cached session).")
+                self._identity_cache[cache_key] = (expected_norm, verified_at)
+                return True
+        except Exception as e:
+            logger.debug("[API] Cookie digest unavailable: %s", e)
+
         if not self.latest_access_token:
              # Try to trigger a fetch to get token first?
              # Or just try the endpoint without token (if browser cookies handle it)
              pass
 
-        target_url = "https://chatgpt.com/backend-api/me"
-        
         try:
             # Fetch 'me' profile
-            result = await self.page.evaluate(f"""async () => {{
-                try {{
-                    const res = await fetch('{target_url}', {{
-                        headers: {{ 'Content-Type': 'application/json' }}
-                    }});
-                    if (res.status === 200) {{
-                        const data = await res.json();
-                        return {{ status: 200, email: data.email }};
-                    }}
-                    return {{ status: res.status, email: null }};
-                }} catch (e) {{
-                    return {{ status: 0, email: null, error: e.toString() }};
-                }}
-            }}""")
+            async with self._api_sem:
+                result = await self._fetch_me()
             
             if result['status'] == 200:
                 actual_email = result.get('email', '')
-                logger.info(f"   👤 Current Session Email: {actual_email}")
+                logger.info("   👤 Current Session Email: %s", actual_email)
                 
-                if actual_email and actual_email.lower().strip() == expected_email.lower().strip():
+                if actual_email and _norm_email(actual_email) == expected_norm:
                     logger.info("[OK]  Identity Verified.")
+                    now = time.monotonic()
+                    self._identity_cache[cache_key] = (expected_norm, now)
+                    if shared_key:
+                        SoraBrowserDriver._verified_identities[shared_key] = now
                     return True
                 else:
-                    logger.error(f"[ERROR]  IDENTITY MISMATCH! Expected: {expected_email} | Found: {actual_email}")
+                    logger.error("[ERROR]  IDENTITY MISMATCH! Expected: %s | Found: %s", expected_email, actual_email)
                     return False
             else:
-                logger.warning(f"[WARNING]  Identity check failed (API {result['status']}). Assuming safe if logged in.")
+                if result['status'] in (401, 403):
+                    self._invalidate_identity_cache()
+                logger.warning("[WARNING]  Identity check failed (API %s). Assuming safe if logged in.", result['status'])
                 # If API fails, we can't verify. 
                 # Strict mode: Return False? 
                 # Lenient mode: Return True (don't block operation if API is flakey)
@@ -784,7 +1416,7 @@ class SoraBrowserDriver(BrowserBasedDriver):
                 return True
                 
         except Exception as e:
-            logger.error(f"Error during identity verify: {e}")
+            logger.error("Error during identity verify: %s", e)
             return True # Fail open to avoid stopping automation on unrelated errors verification logic should be robust
             
         return True
@@ -806,80 +1438,96 @@ class SoraBrowserDriver(BrowserBasedDriver):
         and bypass 'heavy_load' errors that frequent the direct API.
         """
         try:
-            # Prepare Page Object
-            if not self.creation_page:
-                self.creation_page = SoraCreationPage(self.page)
-                
             # Reset interception capture to ensure we get the NEW task ID
             self.last_submission_result = None
+            self._task_id_event.clear()
             
             # Map duration/aspect (UI usually defaults, we might skip setting specific UI controls if selectors missing)
             # TODO: Implement select_duration/aspect_ratio in SoraCreationPage if needed. 
             # For now, we rely on defaults or previous state, as stability is priority.
     
-            # Upload image if provided
-            if image_path:
-                # We still use API for upload as it's reliable and hard to automate via UI drag-drop
-                upload_result = await self.upload_image(image_path)
-                if not upload_result.success:
-                    return VideoResult(success=False, error=upload_result.error)
-                # Note: Linking uploaded file to UI prompt is tricky without 'inpaint' UI logic.
-                # If image is present, we might need to fallback to API or implement complex UI upload.
-                # For now, let's warn if image is used with UI mode.
-                logger.warning("Image provided but UI mode used. Image might not attach correctly without specific UI steps.")
-    
-            # 1. Fill Prompt (UI)
-            # Ensure we are on the creation page
-            logger.info(f"[Generate] Checking page state... Current URL: {self.page.url}")
+            # Upload image if provided. We still use API for upload as it's reliable and hard to
+            # automate via UI drag-drop; it doesn't depend on page state, so it runs behind the UI prep.
+            upload_task = asyncio.create_task(self.upload_image(image_path)) if image_path else None
+            try:
+                # 1. Fill Prompt (UI)
+                # Ensure we are on the creation page
+                logger.info("[Generate] Checking page state... Current URL: %s", self.page.url)
             
-            if "sora.chatgpt.com" not in self.page.url or "auth/login" in self.page.url:
-                logger.info("[Generate] Navigating to Sora Home...")
-                await self.page.goto("https://sora.chatgpt.com/", wait_until="domcontentloaded")
-                await asyncio.sleep(3) # Wait for redirects
+                page_warm = (
+                    time.monotonic() - self._creation_page_ready_at < _CREATION_PAGE_WARM_TTL
+                    and "sora.chatgpt.com" in self.page.url
+                    and "auth/login" not in self.page.url
+                )
+                if page_warm:
+                    # Previous generate left us on the creation page, past Cloudflare
+                    logger.info("[Generate] Creation page still warm, skipping navigation")
+                else:
+                    if "sora.chatgpt.com" not in self.page.url or "auth/login" in self.page.url:
+                        logger.info("[Generate] Navigating to Sora Home...")
+                        await self.page.goto("https://sora.chatgpt.com/", wait_until="domcontentloaded")
+                        try:
+                            # Wait for redirects to settle
+                            await self.page.wait_for_load_state("networkidle", timeout=5000)
+                        except Exception:
+                            pass
             
-            # Check for Login Redirect
-            if "auth/login" in self.page.url:
-                 logger.error(f"[Generate] Redirected to Login Page! Session expired. URL: {self.page.url}")
-                 return VideoResult(success=False, error="Session expired (Redirected to Login)")
-
-            # Wait for Cloudflare challenge to complete
-            logger.info("[Generate] Waiting for Cloudflare challenge to pass...")
-            for _ in range(30): # Max 30 seconds
-                title = await self.page.title()
-                if "Just a moment" not in title and "Cloudflare" not in title:
-                    logger.info(f"[Generate] Cloudflare check passed. Title: {title}")
-                    break
-                await asyncio.sleep(1)
-            else:
-                logger.error("[Generate] Cloudflare challenge timed out.")
-                return VideoResult(success=False, error="Cloudflare challenge timed out")
-
-            # Check for "Get Started" splash
-            if await self.page.is_visible("text='Get started'"):
-                 logger.info("Clicking 'Get started'...")
-                 await self.page.click("text='Get started'")
-                 await asyncio.sleep(1)
-
-            await self.creation_page.fill_prompt(prompt)
+                    # Check for Login Redirect
+                    if "auth/login" in self.page.url:
+                         logger.error("[Generate] Redirected to Login Page! Session expired. URL: %s", self.page.url)
+                         return _SESSION_EXPIRED
+
+                    # Wait for Cloudflare challenge to complete (event-driven, no title polling)
+                    logger.info("[Generate] Waiting for Cloudflare challenge to pass...")
+                    try:
+                        await self.page.wait_for_function(
+                            "() => !/Just a moment|Cloudflare/.test(document.title)",
+                            timeout=30000
+                        )
+                    except Exception as e:
+                        logger.error("[Generate] Cloudflare challenge timed out: %s", e)
+                        return _CLOUDFLARE_TIMED_OUT
+                    logger.info("[Generate] Cloudflare check passed.")
+
+                # Check for "Get Started" splash
+                if await self.creation_page.click_if_visible("text='Get started'"):
+                    logger.info("Clicked 'Get started'")
+
+                await self.creation_page.fill_prompt(prompt)
+
+                if upload_task:
+                    upload_result = await upload_task
+                    if not upload_result.success:
+                        return VideoResult(success=False, error=upload_result.error)
+                    # Note: Linking uploaded file to UI prompt is tricky without 'inpaint' UI logic.
+                    # If image is present, we might need to fallback to API or implement complex UI upload.
+                    # For now, let's warn if image is used with UI mode.
+                    logger.warning("Image provided but UI mode used. Image might not attach correctly without specific UI steps.")
+            finally:
+                if upload_task and not upload_task.done():
+                    upload_task.cancel()
             
             # 2. Click Generate (UI)
             # This triggers the real network request which we hope to intercept
             success = await self.creation_page.click_generate(prompt)
             
             if not success:
-                return VideoResult(success=False, error="UI interaction failed (Click Generate)")
+                self._creation_page_ready_at = 0.0
+                return _UI_SUBMIT_FAILED
+            self._creation_page_ready_at = time.monotonic()
 
             # 3. Capture Task ID via Interception or Fallback
             # We wait up to 15s for the network response to be captured by _on_response_intercept
             task_id = None
             logger.info("[Generate] Waiting for network interception to capture Task ID...")
             
-            for _ in range(30): # 15 seconds
-                if self.last_submission_result:
-                    task_id = self.last_submission_result.get("id")
-                    logger.info(f"[Generate] Intercepted Task ID: {task_id}")
-                    break
-                await asyncio.sleep(0.5)
+            try:
+                await asyncio.wait_for(self._task_id_event.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                pass
+            if self.last_submission_result:
+                task_id = self.last_submission_result.get("id")
+                logger.info("[Generate] Intercepted Task ID: %s", task_id)
                 
             # Fallback: Check pending tasks API if interception missed it
             if not task_id:
@@ -887,18 +1535,24 @@ class SoraBrowserDriver(BrowserBasedDriver):
                 # Give it a moment to appear in backend
                 await asyncio.sleep(3) 
                 pending = await self.get_pending_tasks_api()
-                if pending:
+                task_id = self._lookup_pending_by_prompt(prompt)
+                if task_id:
+                    logger.info("[Generate] Found Task ID via Pending API (Fallback): %s", task_id)
+                elif pending:
                     for p in pending:
                         # Match by prompt content (fuzzy)
                         if prompt[:20] in p.get("prompt", ""):
                             task_id = p.get("id")
-                            logger.info(f"[Generate] Found Task ID via Pending API (Fallback): {task_id}")
+                            logger.info("[Generate] Found Task ID via Pending API (Fallback): %s", task_id)
                             break
             
             # If still no task_id, we can't track it effectively, but if UI said success, 
             # maybe we return a placeholder? But PollWorker needs ID.
             if not task_id:
-                 return VideoResult(success=False, error="Video submitted but failed to capture Task ID for tracking.")
+                 return _TASK_ID_NOT_CAPTURED
+
+            # Submission spent credits
+            self._credits_cache = None
 
             return VideoResult(
                 success=True,
@@ -907,20 +1561,29 @@ class SoraBrowserDriver(BrowserBasedDriver):
             )
             
         except Exception as e:
-            logger.error(f"Generate (UI Mode) failed: {e}", exc_info=True)
+            logger.error("Generate (UI Mode) failed: %s", e, exc_info=True)
             return VideoResult(success=False, error=str(e))
 
-    async def get_credits(self) -> CreditsInfo:
+    async def get_credits(self, force_refresh: bool = False) -> CreditsInfo:
         """
         Get credits information - implements VideoGenerationDriver interface
 
+        Args:
+            force_refresh: Skip the short-lived cache of the last lookup
+
         Returns:
             CreditsInfo with credits remaining
         """
+        # Keyed by token so a rotated token or another account never sees these credits
+        cached = self._credits_cache
+        if (not force_refresh and cached and cached[0] == self.latest_access_token
+                and time.monotonic() - cached[2] < _CREDITS_TTL):
+            return cached[1]
+
         result = await self.get_credits_api()
 
         if result is None:
-            return CreditsInfo(credits=None, error="No access token")
+            return _NO_TOKEN_CREDITS
 
         if "error" in result:
             return CreditsInfo(
@@ -929,10 +1592,12 @@ class SoraBrowserDriver(BrowserBasedDriver):
                 error=result.get("error")
             )
 
-        return CreditsInfo(
+        info = CreditsInfo(
             credits=result.get("credits"),
             reset_seconds=result.get("reset_seconds")
         )
+        self._credits_cache = (self.latest_access_token, info, time.monotonic())
+        return info
 
     async def upload_image(self, image_path: str) -> UploadResult:
         """
@@ -967,7 +1632,7 @@ class SoraBrowserDriver(BrowserBasedDriver):
             poll_interval: Seconds between polls (not used in internal implementation)
 
         Returns:
-            VideoData when complete, None if timeout
+            VideoData when complete or failed (status "failed"), None if timeout
         """
         result = await self.wait_for_completion_api(
             match_prompt="",  # Not needed when task_id provided
@@ -979,7 +1644,8 @@ class SoraBrowserDriver(BrowserBasedDriver):
             return None
 
         if result.get("status") == "failed":
-            return None
+            # Terminal - report it so the caller stops polling (as SoraApiDriver does)
+            return VideoData(id=result.get("id") or "", download_url="", status="failed")
 
         return VideoData(
             id=result.get("id", ""),
@@ -1001,19 +1667,21 @@ class SoraBrowserDriver(BrowserBasedDriver):
             return []
 
         # Convert dicts to PendingTask objects
-        tasks = []
-        for task_dict in result:
-            tasks.append(PendingTask(
+        return [
+            PendingTask(
                 id=task_dict.get("id", ""),
                 status=task_dict.get("status", ""),
                 progress_pct=task_dict.get("progress_pct"),
                 created_at=task_dict.get("created_at")
-            ))
-
-        return tasks
+            )
+            for task_dict in result
+        ]
 
     async def login(self, email: Optional[str] = None, password: Optional[str] = None, cookies: Optional[dict] = None) -> dict:
         await self.start()
+        if email:
+            self._expected_email = email
+            self._expected_email_norm = _norm_email(email)
         await self.login_page.login(email or "", password or "", self.base_url)
         
         # Identity Verification Safeguard
@@ -1023,20 +1691,64 @@ class SoraBrowserDriver(BrowserBasedDriver):
                 logger.error("🚨 CRITICAL: Session Identity Mismatch! Expected different user.")
                 logger.warning("[CLEANUP]  Force Check-out (Clearing Cookies) to prevent cross-account contamination...")
                 
-                # Force Logout
-                try:
-                    await self.page.context.clear_cookies()
-                except:
-                    pass
+                # Force Logout - the CDP round trip runs in the background so the
+                # caller can move on to another account right away
+                self._invalidate_identity_cache()
+                self._cookie_version += 1
+                task = asyncio.create_task(self._safe_clear_cookies())
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
                 
                 raise Exception(f"Session Identity Mismatch: Logged in user is NOT {email}. Cookies cleared.")
         
-        # Wait a bit for traffic to generate token if needed
+        # Reuse a still-valid token captured for this user earlier, else
+        # wait a bit for traffic to generate one
+        if not self.latest_access_token and email and self._restore_token(email):
+             logger.info("[TOKEN]  Reusing unexpired access token captured for this account")
         if not self.latest_access_token:
-             logger.info("[WAIT]  Waiting 5s for token capture after login...")
-             await asyncio.sleep(5)
+             logger.info("[WAIT]  Waiting up to 5s for token capture after login...")
+             try:
+                 await asyncio.wait_for(self._token_event.wait(), timeout=5)
+             except asyncio.TimeoutError:
+                 logger.warning("[WAIT]  No token captured after login")
+        self._remember_token()
         
-        return await self.context.cookies()
+        return await self._get_context_cookies()
+
+    async def _safe_clear_cookies(self) -> None:
+        """Clear the context's cookies, ignoring a context that is already gone"""
+        try:
+            await self.page.context.clear_cookies()
+        except Exception:
+            pass
+        self._cookie_version += 1
+
+    async def _get_context_cookies(self) -> list:
+        """Context cookies, re-enumerated only when the jar may have changed"""
+        key = (id(self.context), self._cookie_version)
+        if self._cookies_cache and self._cookies_cache[:2] == key:
+            return self._cookies_cache[2]
+        cookies = await self.context.cookies()
+        self._cookies_cache = (*key, cookies)
+        return cookies
+
+    async def _get_cookie_header(self, url: str = "https://sora.chatgpt.com") -> str:
+        """
+        Cookie header for a URL, rebuilt only when the jar may have changed.
+
+        Filtered from the cached full jar, so login's identity check and its
+        returned cookie list share a single CDP cookies() call.
+        """
+        key = (id(self.context), self._cookie_version)
+        cached = self._cookie_header_cache.get(url)
+        if cached and cached[:2] == key:
+            return cached[2]
+        parts = urlsplit(url)
+        host, path = parts.hostname or "", parts.path or "/"
+        cookies = await self._get_context_cookies()
+        header = "; ".join(f"{c['name']}={c['value']}" for c in cookies if _cookie_applies(c, host, path))
+        self._cookie_header_cache[url] = (*key, header)
+        return header
 
     
 
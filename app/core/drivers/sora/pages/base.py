@@ -1,6 +1,6 @@
 import logging
 import asyncio
-from playwright.async_api import Page, ElementHandle
+from playwright.async_api import Page, ElementHandle, Locator
 from typing import Optional, List, Union
 
 logger = logging.getLogger(__name__)
@@ -8,6 +8,16 @@ logger = logging.getLogger(__name__)
 class BasePage:
     def __init__(self, page: Page):
         self.page = page
+        # selector -> first-match Locator. Locators resolve lazily on every
+        # use, so cached ones stay valid across reloads and navigation
+        self._loc_cache = {}
+
+    def _loc(self, selector: str) -> Locator:
+        """Cached first-match locator for a selector (same match as page.is_visible/click)"""
+        loc = self._loc_cache.get(selector)
+        if loc is None:
+            loc = self._loc_cache[selector] = self.page.locator(selector).first
+        return loc
 
     async def _snapshot(self, name: str):
         """Helper to save debug screenshot safely"""
@@ -35,24 +45,41 @@ class BasePage:
         except Exception as e:
             logger.error(f"Failed to dump HTML {name}: {e}")
 
-    async def find_first_visible(self, selectors: List[str], timeout: int = 1000) -> Optional[tuple[str, ElementHandle]]:
+    async def visible_selectors(self, selectors: List[str]) -> List[str]:
+        """
+        Selectors (in list order) that currently have a visible match.
+
+        The probes are sent together instead of one after another, so a list
+        costs about one CDP round trip. A selector that errors counts as not
+        visible.
+        """
+        results = await asyncio.gather(
+            *(self._loc(sel).is_visible() for sel in selectors),
+            return_exceptions=True
+        )
+        return [sel for sel, visible in zip(selectors, results) if visible is True]
+
+    async def find_first_visible(self, selectors: List[str]) -> Optional[tuple[str, ElementHandle]]:
         """
         Iterates through a list of selectors and returns the first one that is visible.
+        is_visible() never waits, so this is an instant check - callers poll.
+        All selectors are probed in one batch (see visible_selectors).
         Returns: tuple (selector_string, element_handle) or None
         """
-        for sel in selectors:
+        for sel in await self.visible_selectors(selectors):
             try:
-                if await self.page.is_visible(sel, timeout=timeout):
-                    el = await self.page.query_selector(sel)
+                el = await self.page.query_selector(sel)
+                if el:
                     return sel, el
             except:
                 continue
         return None
 
-    async def click_if_visible(self, selector: str, timeout: int = 500) -> bool:
+    async def click_if_visible(self, selector: str) -> bool:
         try:
-            if await self.page.is_visible(selector, timeout=timeout):
-                await self.page.click(selector)
+            loc = self._loc(selector)
+            if await loc.is_visible():
+                await loc.click()
                 return True
         except:
             pass
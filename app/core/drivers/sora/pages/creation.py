@@ -10,6 +10,58 @@ from ..exceptions import QuotaExhaustedException
 
 logger = logging.getLogger(__name__)
 
+# Common blocking overlay/dialog containers, checked by handle_blocking_overlay
+_OVERLAY_SELECTORS = [
+    ".z-dialog",
+    "[role='dialog']",
+    "div[class*='overlay']",
+    "div[class*='modal']"
+]
+
+# Installs window.__soraSuppressPopups once per document; later calls only
+# send _CALL_SUPPRESS_POPUPS_JS instead of re-shipping and re-parsing this body
+_INSTALL_SUPPRESS_POPUPS_JS = """(keywords) => {
+    window.__soraSuppressPopups = (keywords) => {
+        try {
+            function nuke(text) {
+                const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
+                let node;
+                while (node = walker.nextNode()) {
+                    if (node.textContent.includes(text)) {
+                        let current = node.parentElement;
+                        let depth = 0;
+                        while (current && depth < 10) {
+                            const style = window.getComputedStyle(current);
+                            if (style.position === 'fixed' || style.position === 'absolute' || current.getAttribute('role') === 'dialog') {
+                                console.log('Nuking popup with text:', text);
+                                current.style.display = 'none';
+                                current.style.visibility = 'hidden';
+                                // Also try to remove pointer-events to prevent blocking
+                                current.style.pointerEvents = 'none';
+                                break;
+                            }
+                            current = current.parentElement;
+                            depth++;
+                        }
+                    }
+                }
+            }
+            keywords.forEach(k => nuke(k));
+        } catch (e) {
+             console.error("Popup nuke failed", e);
+        }
+    };
+    window.__soraSuppressPopups(keywords);
+}"""
+
+# Returns false when the document was replaced and the helper is gone
+_CALL_SUPPRESS_POPUPS_JS = """(keywords) => {
+    if (!window.__soraSuppressPopups) return false;
+    window.__soraSuppressPopups(keywords);
+    return true;
+}"""
+
+
 class SoraCreationPage(BasePage):
     """
     [DEPRECATED] UI automation for Sora video creation page.
@@ -52,54 +104,54 @@ class SoraCreationPage(BasePage):
         await self._suppress_popups_js()
         
         # Check specific popup text
-        for txt_ind in SoraSelectors.POPUP_TEXTS:
-            if await self.page.is_visible(txt_ind, timeout=1000):
-                logger.info(f"Popup detected ({txt_ind}). Attempting to close...")
-                
-                # Try close buttons
-                found = await self.find_first_visible(SoraSelectors.POPUP_CLOSE_BTNS)
-                if found:
-                    _, btn = found
-                    await btn.click()
-                    await asyncio.sleep(1)
-                else:
-                    # Click outside or Escape
-                    await self.page.keyboard.press("Escape")
+        await self._close_visible_popups(await self.visible_selectors(SoraSelectors.POPUP_TEXTS))
+
+    async def _close_visible_popups(self, visible: list):
+        """
+        Close each probed popup that is still visible. The texts overlap (one
+        dialog can match several), so each is re-checked after the previous close.
+        """
+        for txt_ind in visible:
+            if await self._loc(txt_ind).is_visible():
+                await self._close_popup(txt_ind)
+
+    async def _close_popup(self, txt_ind: str):
+        logger.info(f"Popup detected ({txt_ind}). Attempting to close...")
+
+        # Try close buttons
+        found = await self.find_first_visible(SoraSelectors.POPUP_CLOSE_BTNS)
+        if found:
+            _, btn = found
+            await btn.click()
+            await asyncio.sleep(1)
+        else:
+            # Click outside or Escape
+            await self.page.keyboard.press("Escape")
+
+    async def clear_blocking_ui(self):
+        """
+        handle_blocking_popups() + handle_blocking_overlay() with their probes
+        overlapped: popup suppression and both visibility batches go out
+        together. Dismissal stays sequential - a popup can also match an
+        overlay selector, and two handlers must not fight over one dialog.
+        """
+        _, popups, overlays = await asyncio.gather(
+            self._suppress_popups_js(),
+            self.visible_selectors(SoraSelectors.POPUP_TEXTS),
+            self.visible_selectors(_OVERLAY_SELECTORS)
+        )
+        # The suppression ran alongside the probe and may have removed some popups
+        await self._close_visible_popups(popups)
+        if overlays:
+            # Re-probes, so an overlay the popup close already removed is skipped
+            await self.handle_blocking_overlay()
     
     async def _suppress_popups_js(self):
         try:
             # We inject keywords to nuke elements containing them
-            js_code = """(keywords) => {
-                try {
-                    function nuke(text) {
-                        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, null, false);
-                        let node;
-                        while (node = walker.nextNode()) {
-                            if (node.textContent.includes(text)) {
-                                let current = node.parentElement;
-                                let depth = 0;
-                                while (current && depth < 10) {
-                                    const style = window.getComputedStyle(current);
-                                    if (style.position === 'fixed' || style.position === 'absolute' || current.getAttribute('role') === 'dialog') {
-                                        console.log('Nuking popup with text:', text);
-                                        current.style.display = 'none';
-                                        current.style.visibility = 'hidden';
-                                        // Also try to remove pointer-events to prevent blocking
-                                        current.style.pointerEvents = 'none';
-                                        break;
-                                    }
-                                    current = current.parentElement;
-                                    depth++;
-                                }
-                            }
-                        }
-                    }
-                    keywords.forEach(k => nuke(k));
-                } catch (e) {
-                     console.error("Popup nuke failed", e);
-                }
-            }"""
-            await self.page.evaluate(js_code, SoraSelectors.POPUP_KEYWORDS)
+            # Cheap call into the installed helper; install it on a fresh document
+            if not await self.page.evaluate(_CALL_SUPPRESS_POPUPS_JS, SoraSelectors.POPUP_KEYWORDS):
+                await self.page.evaluate(_INSTALL_SUPPRESS_POPUPS_JS, SoraSelectors.POPUP_KEYWORDS)
         except Exception as e:
             logger.debug(f"JS Popup suppression benign error: {e}")
 
@@ -209,54 +261,45 @@ class SoraCreationPage(BasePage):
     async def handle_blocking_overlay(self):
         """Detect and close blocking overlays/dialogs"""
         try:
-            # Common overlay selectors
-            overlays = [
-                ".z-dialog", 
-                "[role='dialog']", 
-                "div[class*='overlay']",
-                "div[class*='modal']"
-            ]
-            
-            for selector in overlays:
-                if await self.page.is_visible(selector, timeout=500):
-                    logger.warning(f"Blocking overlay detected: {selector}")
-                    await self._snapshot("blocking_overlay_detected")
-                    
-                    # Try to get text content to understand what it is
-                    try:
-                        el = await self.page.query_selector(selector)
-                        text = await el.text_content()
-                        logger.info(f"Overlay text: {text[:100]}...")
-                    except:
-                        pass
+            for selector in await self.visible_selectors(_OVERLAY_SELECTORS):
+                logger.warning(f"Blocking overlay detected: {selector}")
+                await self._snapshot("blocking_overlay_detected")
+                
+                # Try to get text content to understand what it is
+                try:
+                    el = await self.page.query_selector(selector)
+                    text = await el.text_content()
+                    logger.info(f"Overlay text: {text[:100]}...")
+                except:
+                    pass
 
-                    # Attempt 1: Press Escape
-                    logger.info("Attempting to close overlay via Escape key...")
-                    await self.page.keyboard.press("Escape")
-                    await asyncio.sleep(1)
-                    
-                    if not await self.page.is_visible(selector, timeout=500):
-                        logger.info("Overlay closed via Escape.")
-                        return
-
-                    # Attempt 2: Click Close button
-                    close_btns = [
-                        f"{selector} button[aria-label='Close']",
-                        f"{selector} button:has-text('Close')",
-                        f"{selector} button:has-text('Maybe later')",
-                        f"{selector} button:has-text('X')",
-                        "button[class*='close']"
-                    ]
-                    
-                    for btn_sel in close_btns:
-                        if await self.click_if_visible(btn_sel):
-                            logger.info(f"Clicked close button: {btn_sel}")
-                            await asyncio.sleep(1)
-                            if not await self.page.is_visible(selector, timeout=500):
-                                return
-
-                    logger.warning("Failed to dismiss overlay.")
-                    await self._snapshot("overlay_dismiss_fail")
+                # Attempt 1: Press Escape
+                logger.info("Attempting to close overlay via Escape key...")
+                await self.page.keyboard.press("Escape")
+                await asyncio.sleep(1)
+                
+                if not await self._loc(selector).is_visible():
+                    logger.info("Overlay closed via Escape.")
+                    return
+
+                # Attempt 2: Click Close button
+                close_btns = [
+                    f"{selector} button[aria-label='Close']",
+                    f"{selector} button:has-text('Close')",
+                    f"{selector} button:has-text('Maybe later')",
+                    f"{selector} button:has-text('X')",
+                    "button[class*='close']"
+                ]
+                
+                for btn_sel in close_btns:
+                    if await self.click_if_visible(btn_sel):
+                        logger.info(f"Clicked close button: {btn_sel}")
+                        await asyncio.sleep(1)
+                        if not await self._loc(selector).is_visible():
+                            return
+
+                logger.warning("Failed to dismiss overlay.")
+                await self._snapshot("overlay_dismiss_fail")
         except Exception as e:
             logger.warning(f"Error handling overlay: {e}")
 
@@ -266,10 +309,9 @@ class SoraCreationPage(BasePage):
         Returns true if indicators found.
         """
         try:
-            for ind in SoraSelectors.VIDEO_GENERATING_INDICATORS:
-                if await self.page.is_visible(ind, timeout=1000):
-                    logger.info(f"[OK]  Found generating video indicator: {ind}")
-                    return True
+            for ind in await self.visible_selectors(SoraSelectors.VIDEO_GENERATING_INDICATORS):
+                logger.info(f"[OK]  Found generating video indicator: {ind}")
+                return True
         except Exception as e:
             logger.debug(f"Generation check failed (benign): {e}")
         return False
@@ -280,8 +322,7 @@ class SoraCreationPage(BasePage):
         Returns:
             bool: True if submission was successful (based on UI state change).
         """
-        await self.handle_blocking_popups()
-        await self.handle_blocking_overlay()
+        await self.clear_blocking_ui()
 
         found = await self.find_first_visible(SoraSelectors.GENERATE_BTN)
         if found:
@@ -299,12 +340,11 @@ class SoraCreationPage(BasePage):
 
             # === FAIL FAST: Check for Verification Dialog BEFORE Action ===
             # User specifically requested this strategy for "Verify your phone number"
-            for indicator in SoraSelectors.VERIFICATION_INDICATORS:
-                if await self.page.is_visible(indicator, timeout=500):
-                     logger.error(f"[ERROR]  FAIL FAST: Verification verification detected: {indicator}")
-                     await self._snapshot("fail_fast_verification_start")
-                     from ..exceptions import VerificationRequiredException
-                     raise VerificationRequiredException(f"Verification required (Fail Fast): {indicator}")
+            for indicator in await self.visible_selectors(SoraSelectors.VERIFICATION_INDICATORS):
+                logger.error(f"[ERROR]  FAIL FAST: Verification verification detected: {indicator}")
+                await self._snapshot("fail_fast_verification_start")
+                from ..exceptions import VerificationRequiredException
+                raise VerificationRequiredException(f"Verification required (Fail Fast): {indicator}")
 
             # === PRIMARY METHOD: ENTER KEY ===
             logger.info("Attempting submission via ENTER key (Primary)...")
@@ -339,12 +379,11 @@ class SoraCreationPage(BasePage):
                 logger.warning(f"Enter key submission failed: {e}")
 
             # === FAIL FAST: Check verification after Enter ===
-            for indicator in SoraSelectors.VERIFICATION_INDICATORS:
-                if await self.page.is_visible(indicator, timeout=500):
-                     logger.error(f"[ERROR]  FAIL FAST: Verification detected after Enter: {indicator}")
-                     await self._snapshot("fail_fast_verification_enter")
-                     from ..exceptions import VerificationRequiredException
-                     raise VerificationRequiredException(f"Verification required (After Enter): {indicator}")
+            for indicator in await self.visible_selectors(SoraSelectors.VERIFICATION_INDICATORS):
+                logger.error(f"[ERROR]  FAIL FAST: Verification detected after Enter: {indicator}")
+                await self._snapshot("fail_fast_verification_enter")
+                from ..exceptions import VerificationRequiredException
+                raise VerificationRequiredException(f"Verification required (After Enter): {indicator}")
 
             # === FALLBACK METHOD: CLICKING ===
             logger.info("Falling back to Click method...")
@@ -488,11 +527,10 @@ class SoraCreationPage(BasePage):
 
                 # Check for verification requirements
                 from ..exceptions import VerificationRequiredException
-                for indicator in SoraSelectors.VERIFICATION_INDICATORS:
-                    if await self.page.is_visible(indicator):
-                         logger.warning(f"Verification required after submit: {indicator}")
-                         await self._snapshot("verification_after_submit")
-                         raise VerificationRequiredException(f"Verification required: {indicator}")
+                for indicator in await self.visible_selectors(SoraSelectors.VERIFICATION_INDICATORS):
+                    logger.warning(f"Verification required after submit: {indicator}")
+                    await self._snapshot("verification_after_submit")
+                    raise VerificationRequiredException(f"Verification required: {indicator}")
 
                 # Check button state change
                 try:
@@ -541,14 +579,10 @@ class SoraCreationPage(BasePage):
         check_interval = 4  # Check every 4 seconds
         
         while (asyncio.get_event_loop().time() - start_time) < max_wait:
-            # Check for completion indicators
-            for indicator in SoraSelectors.VIDEO_COMPLETION_INDICATORS:
-                try:
-                    if await self.page.is_visible(indicator, timeout=1000):
-                        logger.info(f"[OK]  Video completion detected: {indicator}")
-                        return True
-                except:
-                    continue
+            # Check for completion indicators (all probed in one batch)
+            for indicator in await self.visible_selectors(SoraSelectors.VIDEO_COMPLETION_INDICATORS):
+                logger.info(f"[OK]  Video completion detected: {indicator}")
+                return True
             
             await asyncio.sleep(check_interval)
         
@@ -600,8 +634,7 @@ class SoraCreationPage(BasePage):
             except:
                 pass
                 
-            await self.handle_blocking_popups()
-            await self.handle_blocking_overlay()
+            await self.clear_blocking_ui()
             
             # Find and click Share button
             found = await self.find_first_visible(SoraSelectors.SHARE_BUTTON)
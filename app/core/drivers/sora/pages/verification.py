@@ -25,25 +25,15 @@ class SoraVerificationPage(BasePage):
     async def check_quota_exhausted(self) -> bool:
         """Check if account has run out of video generations OR requires verification"""
         # 1. Check Quota
-        for indicator in SoraSelectors.QUOTA_EXHAUSTED_INDICATORS:
-            try:
-                if await self.page.is_visible(indicator, timeout=1000):
-                    logger.warning(f"Quota exhausted indicator found: {indicator}")
-                    return True
-            except:
-                continue
+        for indicator in await self.visible_selectors(SoraSelectors.QUOTA_EXHAUSTED_INDICATORS):
+            logger.warning(f"Quota exhausted indicator found: {indicator}")
+            return True
 
         # 2. Check Verification/Checkpoint
-        for indicator in SoraSelectors.VERIFICATION_INDICATORS:
-             try:
-                 if await self.page.is_visible(indicator, timeout=1000):
-                     logger.warning(f"Verification indicator found: {indicator}")
-                     await self._snapshot("verification_detected")
-                     raise VerificationRequiredException(f"Verification required: {indicator}")
-             except VerificationRequiredException:
-                 raise
-             except:
-                 continue
+        for indicator in await self.visible_selectors(SoraSelectors.VERIFICATION_INDICATORS):
+            logger.warning(f"Verification indicator found: {indicator}")
+            await self._snapshot("verification_detected")
+            raise VerificationRequiredException(f"Verification required: {indicator}")
                  
         return False
 
@@ -124,13 +114,9 @@ class SoraVerificationPage(BasePage):
         check_interval = 4
         
         while (asyncio.get_event_loop().time() - start_time) < max_wait:
-            for indicator in SoraSelectors.VIDEO_COMPLETION_INDICATORS:
-                try:
-                    if await self.page.is_visible(indicator, timeout=1000):
-                        logger.info(f"[OK]  Video completion detected: {indicator}")
-                        return True
-                except:
-                    continue
+            for indicator in await self.visible_selectors(SoraSelectors.VIDEO_COMPLETION_INDICATORS):
+                logger.info(f"[OK]  Video completion detected: {indicator}")
+                return True
             await asyncio.sleep(check_interval)
         
         logger.warning(f"⏱️ Video completion timeout after {max_wait}s")
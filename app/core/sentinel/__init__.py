@@ -1,6 +1,7 @@
 # Sentinel Token Generator Module
 # Adapted from github.com/leetanshaj/openai-sentinel for internal use
 
+import asyncio
 import hashlib
 import json
 import random
@@ -179,3 +180,43 @@ def get_sentinel_token(flow: str = "sora_create_task") -> str:
             'id': str(uuid.uuid4()),
             'flow': flow
         })
+
+
+async def aget_sentinel_token(flow: str = "sora_create_task") -> str:
+    """
+    Async variant of get_sentinel_token for use inside coroutines.
+
+    The PoW solve and the sentinel/req POST are both blocking, so they run
+    in a worker thread instead of stalling the event loop.
+    """
+    return await asyncio.to_thread(get_sentinel_token, flow)
+
+
+# Sentinel tokens stay valid for tens of seconds; back-to-back requests reuse one
+SENTINEL_TTL = 20.0
+_token_cache = {}  # flow -> (generated at, token)
+
+
+async def aget_cached_sentinel_token(flow: str = "sora_create_task") -> str:
+    """
+    aget_sentinel_token, reusing a token for the same flow within SENTINEL_TTL.
+
+    Call invalidate_sentinel_token when the backend rejects a cached token.
+    """
+    cached = _token_cache.get(flow)
+    if cached and time.monotonic() - cached[0] < SENTINEL_TTL:
+        return cached[1]
+
+    token = await aget_sentinel_token(flow)
+    _token_cache[flow] = (time.monotonic(), token)
+    return token
+
+
+def invalidate_sentinel_token(flow: str) -> None:
+    """Drop the cached token for a flow so the next call generates a fresh one"""
+    _token_cache.pop(flow, None)
+
+
+def is_sentinel_error(error) -> bool:
+    """True when an API error looks like a rejected sentinel token"""
+    return "sentinel" in str(error or "").lower()
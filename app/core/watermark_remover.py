@@ -4,6 +4,7 @@ import logging
 import os
 import asyncio
 from typing import Optional
+from app.core.drivers import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +72,7 @@ class WatermarkRemover:
                 return None
             
             try:
-                data = response.json()
+                data = json_utils.loads(response.content)
             except Exception as json_err:
                 logger.error(f"[WATERMARK] JSON parse failed: {json_err}. Raw: {raw_text}")
                 return None
@@ -12,7 +12,7 @@ from ...database import SessionLocal
 import aiohttp
 from ..watermark_remover import WatermarkRemover
 from ..drivers.api_client import SoraApiClient
-from ..sentinel import get_sentinel_token
+from ..sentinel import aget_sentinel_token
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,27 @@ class DownloadWorker(BaseWorker):
     ):
         super().__init__(max_concurrent, stop_event)
         self.job_repo = job_repo
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for video downloads (created lazily)"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+            )
+        return self._http
+
+    async def stop(self):
+        """Stop worker, then close the shared download session"""
+        await super().stop()
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
 
     def get_queue(self):
         """Get download queue"""
@@ -89,7 +110,7 @@ class DownloadWorker(BaseWorker):
                         # Get Sentinel Token
                         sentinel_token = "{}"
                         try:
-                            token_data = get_sentinel_token(flow="sora_2_create_post")
+                            token_data = await aget_sentinel_token(flow="sora_2_create_post")
                             sentinel_token = json.dumps(json.loads(token_data) if isinstance(token_data, str) else token_data)
                         except Exception as st_err:
                             logger.warning(f"[WATERMARK] Sentinel gen failed: {st_err}")
@@ -98,14 +119,18 @@ class DownloadWorker(BaseWorker):
                             pass
 
                         # Call WatermarkRemover
-                        clean_url = await WatermarkRemover.process_video(
-                            video_id=video_id,
-                            api_client=api_client,
-                            sentinel_token=sentinel_token,
-                            title=job.spec.prompt[:50] + "..." if job.spec.prompt else "Sora Video",
-                            description=job.spec.prompt or "",
-                            generation_id=generation_id
-                        )
+                        try:
+                            clean_url = await WatermarkRemover.process_video(
+                                video_id=video_id,
+                                api_client=api_client,
+                                sentinel_token=sentinel_token,
+                                title=job.spec.prompt[:50] + "..." if job.spec.prompt else "Sora Video",
+                                description=job.spec.prompt or "",
+                                generation_id=generation_id
+                            )
+                        finally:
+                            # Release the client's pooled curl connection
+                            await api_client.aclose()
                         if clean_url:
                             logger.info(f"[WATERMARK] Success! Switching download to clean URL.")
                             download_url = clean_url
@@ -124,43 +149,44 @@ class DownloadWorker(BaseWorker):
 
             filename = f"{download_dir}/sora_{job.id.value}_{video_id or 'unknown'}.mp4"
 
-            async with aiohttp.ClientSession() as http_session:
-                async with http_session.get(download_url) as response:
-                    if response.status == 200:
-                        total_size = 0
-                        with open(filename, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                f.write(chunk)
-                                total_size += len(chunk)
-
-                        # 4. Verify file
-                        if total_size < 10000:
-                            raise Exception(f"File too small: {total_size} bytes")
-
-                        # 5. Update job
-                        logger.info(f"[OK] Downloaded {filename} ({total_size:,} bytes)")
-
-                        job.progress.status = JobStatus.DONE
-                        job.progress.progress = 100
-                        job.result.local_path = f"/downloads/{os.path.basename(filename)}"
-
-                        # Update task_state - preserve existing data
-                        if not job.task_state:
-                            job.task_state = {}
-                        if "tasks" not in job.task_state:
-                            job.task_state["tasks"] = {}
-
-                        job.task_state["tasks"]["download"] = {"status": "completed"}
-                        job.task_state["current_task"] = "completed"
-                        
-                        # Record if clean
-                        if clean_url:
-                             job.task_state["is_clean_video"] = True
+            # Shared keep-alive session - no new connector/DNS/TLS per job
+            http_session = self._get_http_session()
+            async with http_session.get(download_url) as response:
+                if response.status == 200:
+                    total_size = 0
+                    with open(filename, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(8192):
+                            f.write(chunk)
+                            total_size += len(chunk)
+
+                    # 4. Verify file
+                    if total_size < 10000:
+                        raise Exception(f"File too small: {total_size} bytes")
+
+                    # 5. Update job
+                    logger.info(f"[OK] Downloaded {filename} ({total_size:,} bytes)")
+
+                    job.progress.status = JobStatus.DONE
+                    job.progress.progress = 100
+                    job.result.local_path = f"/downloads/{os.path.basename(filename)}"
+
+                    # Update task_state - preserve existing data
+                    if not job.task_state:
+                        job.task_state = {}
+                    if "tasks" not in job.task_state:
+                        job.task_state["tasks"] = {}
+
+                    job.task_state["tasks"]["download"] = {"status": "completed"}
+                    job.task_state["current_task"] = "completed"
+                    
+                    # Record if clean
+                    if clean_url:
+                         job.task_state["is_clean_video"] = True
 
-                        await job_repo.update(job)
-                        job_repo.commit()
-                    else:
-                        raise Exception(f"HTTP {response.status}")
+                    await job_repo.update(job)
+                    job_repo.commit()
+                else:
+                    raise Exception(f"HTTP {response.status}")
 
         except Exception as e:
             logger.error(f"[ERROR] Download task failed for Job #{task.job_id}: {e}", exc_info=True)
@@ -0,0 +1,97 @@
+"""
+Unit tests for SoraApiClient module helpers
+
+Tests:
+- encode_video_payload round trips
+- clean_file_id
+- _parse_reset duration strings
+"""
+import json
+
+import pytest
+from app.core.drivers.api_client import (
+    build_video_payload,
+    clean_file_id,
+    encode_video_payload,
+    _parse_reset,
+)
+
+
+class TestEncodeVideoPayload:
+    """Test the pre-serialized nf/create body"""
+
+    def test_round_trip_without_image(self):
+        """Test a template payload decodes back to itself"""
+        payload = build_video_payload("A cat on a skateboard", "landscape", 300)
+        assert json.loads(encode_video_payload(payload)) == payload
+
+    def test_round_trip_with_image(self):
+        """Test the image attachment survives encoding"""
+        payload = build_video_payload("A dog", "portrait", 150, file_id="file_abc123")
+        body = encode_video_payload(payload)
+        assert json.loads(body) == payload
+        assert json.loads(body)["inpaint_items"] == [{"kind": "file", "file_id": "file_abc123"}]
+
+    def test_round_trip_with_edited_template_field(self):
+        """Test an edited template field is not replaced by the cached prefix"""
+        payload = build_video_payload("A bird", "square", 450)
+        payload["title"] = "My title"
+        payload["style_id"] = "retro"
+        assert json.loads(encode_video_payload(payload)) == payload
+
+    def test_round_trip_with_extra_key(self):
+        """Test keys outside the template are kept"""
+        payload = build_video_payload("A fish", "landscape", 300)
+        payload["extra"] = {"nested": [1, 2]}
+        assert json.loads(encode_video_payload(payload)) == payload
+
+    def test_round_trip_with_missing_variant_key(self):
+        """Test a payload missing a per-call field is still encoded as-is"""
+        payload = build_video_payload("A frog", "landscape", 300)
+        del payload["model"]
+        payload["unrelated"] = None
+        assert json.loads(encode_video_payload(payload)) == payload
+
+    def test_prompt_is_escaped(self):
+        """Test quotes and unicode in the prompt stay valid JSON"""
+        prompt = 'He said "hi"\nthen left – café'
+        payload = build_video_payload(prompt, "landscape", 300)
+        assert json.loads(encode_video_payload(payload))["prompt"] == prompt
+
+    def test_returns_bytes(self):
+        """Test the body is ready to send as-is"""
+        payload = build_video_payload("A cat", "landscape", 300)
+        assert isinstance(encode_video_payload(payload), bytes)
+
+
+class TestCleanFileId:
+    """Test upload file ID normalization"""
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("file_abc123", "file_abc123"),
+        ("file-abc123", "file-abc123"),
+        ("sediment#file_abc123", "file_abc123"),
+        ("sediment#file_abc123#suffix", "file_abc123"),
+        ("gen_01xyz", "gen_01xyz"),
+        ("", ""),
+    ])
+    def test_clean_file_id(self, raw, expected):
+        """Test '#'-joined parts around the file ID are stripped"""
+        assert clean_file_id(raw) == expected
+
+
+class TestParseReset:
+    """Test x-ratelimit-reset parsing"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("12", 12.0),
+        ("1.5", 1.5),
+        ("1.5s", 1.5),
+        ("20ms", 0.02),
+        ("6m0s", 360.0),
+        ("1h2m3s", 3723.0),
+        ("", 0.0),
+    ])
+    def test_parse_reset(self, value, expected):
+        """Test plain seconds and Go-style duration strings"""
+        assert _parse_reset(value) == pytest.approx(expected)
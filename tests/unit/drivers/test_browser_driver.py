@@ -0,0 +1,68 @@
+"""
+Unit tests for SoraBrowserDriver module helpers
+
+Tests:
+- _match_endpoint classification of intercepted URLs
+- _cookie_applies domain/path matching
+"""
+import pytest
+from app.core.drivers.sora.browser_driver import _cookie_applies, _match_endpoint
+
+
+class TestMatchEndpoint:
+    """Test intercepted URL classification"""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://sora.chatgpt.com/backend/project_y/profile/drafts?limit=15", "DRAFTS"),
+        ("https://sora.chatgpt.com/backend/nf/pending/v2", "PENDING"),
+        ("https://sora.chatgpt.com/backend/nf/create", "SUBMISSION"),
+        ("https://sora.chatgpt.com/backend/project_y/feed?limit=8", "FEED"),
+        ("https://sora.chatgpt.com/backend/video_gen/tasks", "TASKS"),
+        ("https://sora.chatgpt.com/backend/uploads/create", "unknown"),
+    ])
+    def test_sora_endpoints(self, url, expected):
+        """Test parsed Sora endpoints map to their type"""
+        assert _match_endpoint(url) == expected
+
+    @pytest.mark.parametrize("url", [
+        "https://chatgpt.com/backend-api/me",
+        "https://chatgpt.com/backend-api/profile/drafts",
+        "https://sora.chatgpt.com/backend/project_y/post",
+        "https://cdn.openai.com/sora/app.js",
+    ])
+    def test_other_urls(self, url):
+        """Test URLs we don't parse return None"""
+        assert _match_endpoint(url) is None
+
+
+class TestCookieApplies:
+    """Test which context cookies are sent to a URL"""
+
+    def test_domain_cookie_matches_host_and_subdomains(self):
+        """Test a leading-dot domain covers the host and its subdomains"""
+        cookie = {"domain": ".chatgpt.com", "path": "/"}
+        assert _cookie_applies(cookie, "chatgpt.com", "/")
+        assert _cookie_applies(cookie, "sora.chatgpt.com", "/backend/nf/create")
+
+    def test_domain_cookie_rejects_lookalike_host(self):
+        """Test suffix matching stops at a label boundary"""
+        cookie = {"domain": ".chatgpt.com", "path": "/"}
+        assert not _cookie_applies(cookie, "notchatgpt.com", "/")
+        assert not _cookie_applies(cookie, "openai.com", "/")
+
+    def test_host_only_cookie(self):
+        """Test a host-only cookie is not sent to subdomains"""
+        cookie = {"domain": "chatgpt.com", "path": "/"}
+        assert _cookie_applies(cookie, "chatgpt.com", "/backend-api/me")
+        assert not _cookie_applies(cookie, "sora.chatgpt.com", "/")
+
+    def test_path_prefix(self):
+        """Test the cookie path must prefix the request path"""
+        cookie = {"domain": ".chatgpt.com", "path": "/backend-api"}
+        assert _cookie_applies(cookie, "chatgpt.com", "/backend-api/me")
+        assert not _cookie_applies(cookie, "chatgpt.com", "/auth/login")
+
+    def test_missing_path_defaults_to_root(self):
+        """Test a cookie without a path applies everywhere on its domain"""
+        cookie = {"domain": ".chatgpt.com"}
+        assert _cookie_applies(cookie, "sora.chatgpt.com", "/anything")